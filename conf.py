@@ -1,5 +1,6 @@
 from docutils import nodes
 from docutils.parsers.rst.states import Inliner, Struct
+import functools
 import inspect
 from snippets.util import get_first_docstring_paragraph
 from sphinx.application import Sphinx
@@ -34,6 +35,25 @@ def setup(app: Sphinx):
     app.add_role("docitem", docitem)
 
 
+# Docstrings do not change during a build so we only parse each one once.
+_get_first_docstring_paragraph = functools.lru_cache(maxsize=None)(
+    get_first_docstring_paragraph
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve(path: str) -> Tuple[Any, str]:
+    """
+    Import the object at the given path and determine its reference role.
+    """
+    *modules, obj = path.split(".")
+    modules = ".".join(modules)
+    module = __import__(modules, fromlist=modules)
+    obj = getattr(module, obj)
+    refrole = "func" if inspect.isfunction(obj) else "class"
+    return obj, refrole
+
+
 def docitem(
     name: str,
     rawtext: str,
@@ -53,17 +73,10 @@ def docitem(
     content = content or []
 
     # Get the first line of the docstring.
-    *modules, obj = text.split(".")
-    modules = ".".join(modules)
-    module = __import__(modules, fromlist=modules)
-    obj = getattr(module, obj)
-    paragraph = get_first_docstring_paragraph(obj)
+    obj, refrole = _resolve(text)
+    paragraph = _get_first_docstring_paragraph(obj)
 
     # Prepend the reference to the underlying object.
-    if inspect.isfunction(obj):
-        refrole = "func"
-    else:
-        refrole = "class"
     paragraph = f":{refrole}:`~{text}`: {paragraph}"
 
     memo = Struct(
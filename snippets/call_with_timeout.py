@@ -1,16 +1,21 @@
 import multiprocessing
-from queue import Empty
+from multiprocessing.connection import Connection
+import os
+import pickle
+from queue import Empty, Queue
+import signal
+import threading
+import time
 import traceback
-from typing import Any, Callable
-from .util import raise_for_missing_modules
-
-
-with raise_for_missing_modules():
-    import psutil
+from typing import Any, Callable, Optional, Tuple
 
 
 # Time to wait for processes that have been terminated or killed in seconds.
 JOIN_TIMEOUT = 3
+# Long-lived worker process evaluating isolated calls together with the connection for
+# sending requests and receiving responses.
+_WORKER: Optional[Tuple[multiprocessing.Process, Connection]] = None
+_WORKER_LOCK = threading.Lock()
 
 
 class ZombieProcessError(RuntimeError):
@@ -19,9 +24,9 @@ class ZombieProcessError(RuntimeError):
     """
 
 
-def _wrapper(queue: multiprocessing.Queue, target: Callable, *args, **kwargs) -> None:
+def _wrapper(send: Callable[[Any], None], target: Callable, *args, **kwargs) -> None:
     """
-    Wrapper to execute a function in a subprocess.
+    Wrapper to execute a function in a thread or subprocess and send the result.
     """
     try:
         result = target(*args, **kwargs)
@@ -29,17 +34,151 @@ def _wrapper(queue: multiprocessing.Queue, target: Callable, *args, **kwargs) ->
     except Exception as ex:
         result = (ex, traceback.format_exc())
         success = False
-    queue.put_nowait((success, result))
+    send((success, result))
+
+
+def _serve(connection: Connection) -> None:  # pragma: no cover (runs in the worker)
+    """
+    Evaluate targets in a worker process until it is terminated.
+    """
+    # Start a new session so the worker and all its children can be signaled as a
+    # process group.
+    os.setsid()
+    while True:
+        # Load the request separately so targets that cannot be unpickled, e.g., because
+        # they were defined after the worker started, are reported instead of killing
+        # the worker.
+        request = connection.recv_bytes()
+        try:
+            target, args, kwargs = pickle.loads(request)
+        except Exception as ex:
+            connection.send((None, (ex, traceback.format_exc())))
+            continue
+        _wrapper(connection.send, target, *args, **kwargs)
+
+
+def _get_worker() -> Tuple[multiprocessing.Process, Connection]:
+    """
+    Get the worker process for isolated calls, starting it if necessary.
+    """
+    global _WORKER
+    if _WORKER is None or not _WORKER[0].is_alive():
+        # A pipe has lower overhead than a queue because it neither needs a feeder
+        # thread nor locks. It also serializes requests in the calling thread so errors
+        # are raised immediately.
+        connection, child_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_serve, args=(child_connection,), daemon=True
+        )
+        process.start()
+        # Close our copy of the worker's end so we notice if the worker exits.
+        child_connection.close()
+        _WORKER = process, connection
+    return _WORKER
+
+
+def _stop_worker() -> None:
+    """
+    Terminate the worker process and all its children.
+    """
+    global _WORKER
+    process, connection = _WORKER
+    _WORKER = None
+    connection.close()
+    if not process.is_alive():
+        return  # pragma: no cover
+
+    # Try to terminate the process group comprising the worker and all its children. If
+    # not possible, kill them.
+    if os.getpgid(process.pid) != process.pid:  # pragma: no cover
+        # The worker has not started its own session yet and cannot have any children.
+        process.kill()
+        process.join()
+        return
+    for signum in [signal.SIGTERM, signal.SIGKILL]:
+        try:
+            os.killpg(process.pid, signum)
+        except ProcessLookupError:  # pragma: no cover
+            return
+        if _wait_for_process_group(process, JOIN_TIMEOUT):
+            return
+    raise ZombieProcessError(f"processes in group {process.pid} still alive")
+
+
+def _call_worker(
+    message: str, deadline: float, target: Callable, args: tuple, kwargs: dict
+) -> Tuple[Optional[bool], Any]:
+    """
+    Send a request to the worker and wait for the response until the deadline.
 
+    Returns:
+        Success flag which is :code:`None` if the worker could not load the request and
+        the result or exception with traceback.
+    """
+    _, connection = _get_worker()
+    try:
+        connection.send((target, args, kwargs))
+        if not connection.poll(max(deadline - time.monotonic(), 0)):
+            raise TimeoutError(message)
+        return connection.recv()
+    except EOFError:
+        _stop_worker()
+        raise RuntimeError(f"worker process evaluating {target} exited unexpectedly")
+    except BaseException:
+        # Stop the worker if we do not read its response, e.g., after a timeout or
+        # interrupt, so a stale response is never handed to the next call.
+        _stop_worker()
+        raise
+
+
+def _wait_for_process_group(process: multiprocessing.Process, timeout: float) -> bool:
+    """
+    Wait for all processes in the group led by a process to exit.
 
-def call_with_timeout(timeout: float, target: Callable, *args, **kwargs) -> Any:
+    Returns:
+        If all processes exited within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        # Reap the worker so it does not linger as a zombie in the group.
+        process.join(0)
+        try:
+            os.killpg(process.pid, 0)
+        except ProcessLookupError:
+            return True
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+
+
+def call_with_timeout(
+    timeout: float, target: Callable, *args, isolate: bool = False, **kwargs
+) -> Any:
     """
     Call a target with a timeout and return its result.
 
+    By default, the target is evaluated in a daemon thread which avoids the overhead of
+    starting a process and serializing arguments and results. A thread cannot be killed,
+    however, and the target keeps running in the background if it does not complete in
+    time. Use :code:`isolate=True` to evaluate the target in a long-lived worker
+    process which is terminated, together with all its children, if the timeout
+    expires. The worker is started on demand and reused for subsequent isolated calls to
+    avoid the cost of starting a process for each call.
+
+    The worker is forked from the calling process, and it sees the state of the
+    interpreter at that time. Changes to globals made by the caller later, including
+    redefined functions, are not visible to the worker, and changes to globals made by
+    targets persist across isolated calls. If the worker cannot load a target, e.g.,
+    because it was defined after the worker started, the worker is restarted once.
+    Isolated calls from different threads are serialized, and time spent waiting for
+    the worker counts toward the timeout.
+
     Args:
         timeout: Number of seconds to wait for a result.
-        target: Callable to evaluate which must be serializable with :mod:`pickle`.
+        target: Callable to evaluate which must be serializable with :mod:`pickle` if
+            :code:`isolate` is set.
         *args: Positional arguments passed to :code:`target`.
+        isolate: Evaluate the target in a subprocess.
         **kwargs: Keyword arguments passed to :code:`target`.
 
     Returns:
@@ -64,30 +203,33 @@ def call_with_timeout(timeout: float, target: Callable, *args, **kwargs) -> Any:
             TimeoutError: call to <built-in function sleep> did not complete in 1.0
             seconds
     """
-    queue = multiprocessing.Queue()
-    process = multiprocessing.Process(
-        target=_wrapper, args=(queue, target, *args), kwargs=kwargs, daemon=True
-    )
-    process.start()
-
-    try:
-        success, result = queue.get(timeout=timeout)
-    except Empty:
-        raise TimeoutError(f"call to {target} did not complete in {timeout} seconds")
-    finally:
-        if process.is_alive():
-            # Try to terminate the process and all its children. If not possible, kill
-            # them (https://stackoverflow.com/a/4229404/1150961).
-            process = psutil.Process(process.pid)
-            processes = [process, *process.children(recursive=True)]
-            for func in [psutil.Process.terminate, psutil.Process.kill]:
-                for process in processes:
-                    func(process)
-                _, processes = psutil.wait_procs(processes, timeout=JOIN_TIMEOUT)
-                if not processes:
-                    break
-            if processes:
-                raise ZombieProcessError(f"processes still alive: {len(processes)}")
+    message = f"call to {target} did not complete in {timeout} seconds"
+    if isolate:
+        deadline = time.monotonic() + timeout
+        if not _WORKER_LOCK.acquire(timeout=timeout):
+            raise TimeoutError(message)
+        try:
+            success, result = _call_worker(message, deadline, target, args, kwargs)
+            if success is None:
+                # Restart the worker from the current state of the interpreter so it
+                # can load targets defined after it started.
+                _stop_worker()
+                success, result = _call_worker(message, deadline, target, args, kwargs)
+        finally:
+            _WORKER_LOCK.release()
+    else:
+        responses = Queue()
+        thread = threading.Thread(
+            target=_wrapper,
+            args=(responses.put_nowait, target, *args),
+            kwargs=kwargs,
+            daemon=True,
+        )
+        thread.start()
+        try:
+            success, result = responses.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError(message)
     if not success:
         ex, tb = result
         raise RuntimeError(tb) from ex
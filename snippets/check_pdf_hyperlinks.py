@@ -1,21 +1,127 @@
 import argparse
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pathlib import Path
-from urllib.error import URLError
+import sqlite3
 from urllib.parse import urlparse
 import sys
-from tqdm import tqdm
-from typing import Generator, List, Optional, Tuple
+import time
+from tqdm.asyncio import tqdm
+from typing import Dict, Generator, Iterable, List, Optional, Set, Tuple, Union
 from .util import get_first_docstring_paragraph, raise_for_missing_modules
 
 with raise_for_missing_modules():
     import colorama
-    import mechanize
+    from curl_cffi import CurlECode, requests as curl_requests
+    from curl_cffi.curl import CURL_WRITEFUNC_ERROR
+    import httpx
     import pypdf
-    import requests
+
+
+HEADERS = {
+    # Some websites strictly check the user agent to be a browser.
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Safari/605.1.15",
+    "Accept": "text/html,*/*",
+}
+# Status codes returned by some servers that do not support `HEAD` requests.
+HEAD_UNSUPPORTED_STATUS_CODES = {403, 405, 501}
+# Time to wait for a response in seconds.
+TIMEOUT = 10
+# Default location of the cache of validated urls.
+DEFAULT_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "snippets"
+    / "check_pdf_hyperlinks.sqlite"
+)
+# Mapping of response headers to conditional request headers for cache validation.
+VALIDATOR_HEADERS = {
+    "ETag": "If-None-Match",
+    "Last-Modified": "If-Modified-Since",
+}
 
 
 class Args:
     filenames: List[Path]
+    max_workers: int
+    cache: Optional[Path]
+    cache_ttl: float
+
+
+class UrlCache:
+    """
+    Persistent cache of validated urls backed by :mod:`sqlite3`.
+
+    Args:
+        path: Path of the database.
+        ttl: Number of seconds after which cached urls are validated again.
+    """
+
+    def __init__(self, path: Path, ttl: float) -> None:
+        self.ttl = ttl
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, etag TEXT, "
+            "last_modified TEXT, last_ok_ts INTEGER)"
+        )
+
+    def get(self, url: str) -> Tuple[bool, Dict[str, str]]:
+        """
+        Look up a url in the cache.
+
+        Args:
+            url: Url to look up.
+
+        Returns:
+            Tuple of whether the url was validated within the time to live and headers
+            for a conditional request to validate the url again.
+        """
+        row = self.connection.execute(
+            "SELECT etag, last_modified, last_ok_ts FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return False, {}
+        etag, last_modified, last_ok_ts = row
+        headers = {"If-None-Match": etag, "If-Modified-Since": last_modified}
+        return (
+            time.time() - last_ok_ts < self.ttl,
+            {key: value for key, value in headers.items() if value},
+        )
+
+    def set(self, url: str, validators: Dict[str, str]) -> None:
+        """
+        Record a url as valid.
+
+        Args:
+            url: Url that was validated.
+            validators: Response headers used to validate the url again.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?)",
+                (
+                    url,
+                    validators.get("ETag"),
+                    validators.get("Last-Modified"),
+                    int(time.time()),
+                ),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def _get_action_uri(action: "pypdf.generic.DictionaryObject") -> Optional[str]:
+    """
+    Get the uri of a link action or :code:`None` if it is not a uri action, e.g., a
+    reference to a location within the document.
+    """
+    if action.get("/S") != "/URI":
+        return None
+    return action.get("/URI")
 
 
 def get_urls(filename: Path) -> Generator[Tuple[int, str], None, None]:
@@ -23,48 +129,213 @@ def get_urls(filename: Path) -> Generator[Tuple[int, str], None, None]:
     Extract page numbers and urls from a pdf document.
     """
     reader = pypdf.PdfReader(filename)
-    for page in reader.pages:
+    # Cache of uris keyed by the object number of shared link actions.
+    uris_by_idnum: Dict[int, Optional[str]] = {}
+    for page_number, page in enumerate(reader.pages):
         annotations = page.get("/Annots")
         if annotations is None:
             continue  # pragma: no cover
         for annotation in annotations.get_object():
             annotation = annotation.get_object()
-            anchor = annotation.get("/A")
+            # Skip other annotations early before resolving the action.
+            if annotation.get("/Subtype") != "/Link":
+                continue  # pragma: no cover
+            anchor = annotation.raw_get("/A") if "/A" in annotation else None
             if not anchor:
                 continue  # pragma: no cover
-            uri = anchor.get_object().get("/URI")
+            if isinstance(anchor, pypdf.generic.IndirectObject):
+                if anchor.idnum not in uris_by_idnum:
+                    uris_by_idnum[anchor.idnum] = _get_action_uri(anchor.get_object())
+                uri = uris_by_idnum[anchor.idnum]
+            else:
+                uri = _get_action_uri(anchor)
             if uri and uri.startswith("http"):
-                yield (page.page_number, uri)
+                yield (page_number, uri)
+
+
+def _get_pages_by_url(filename: Path) -> Dict[str, Set[int]]:
+    """
+    Extract unique urls and the page numbers they appear on from a pdf document (used
+    for parsing in subprocesses).
+    """
+    pages_by_url = defaultdict(set)
+    for page, url in get_urls(filename):
+        pages_by_url[url].add(page)
+    return dict(pages_by_url)
 
 
-def validate_url(url):
-    headers = {
-        # Some websites strictly check the user agent to be a browser.
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/18.1 Safari/605.1.15",
-        "Accept": "text/html,*/*",
+def _get_validators(
+    response: Union[httpx.Response, curl_requests.Response]
+) -> Dict[str, str]:
+    """
+    Get response headers that can be used to validate a url using a conditional request.
+    """
+    return {
+        key: response.headers[key]
+        for key in VALIDATOR_HEADERS
+        if key in response.headers
     }
 
+
+def _validate_url_impersonating(url: str) -> Dict[str, str]:
+    """
+    Validate a url impersonating the TLS fingerprint of a browser.
+    """
+    # Abort the transfer when the body starts to avoid downloading large documents. We
+    # do not use `stream=True` because it can deadlock if the request fails quickly.
     try:
-        parsed = urlparse(url)
-        response = requests.get(
+        response = curl_requests.get(
             url,
-            allow_redirects=not parsed.hostname.endswith("doi.org"),
-            headers=headers,
+            impersonate="chrome",
+            timeout=TIMEOUT,
+            content_callback=lambda chunk: CURL_WRITEFUNC_ERROR,
         )
-        response.raise_for_status()
-        return  # We successfully validated the url using requests.
-    except (requests.HTTPError, requests.ConnectionError):
-        # Failed to validate url using `requests`; trying `mechanize` ...
+    except curl_requests.RequestsError as ex:
+        if ex.code != CurlECode.WRITE_ERROR:
+            raise
+        response = ex.response
+    response.raise_for_status()
+    return _get_validators(response)
+
+
+def validate_url(url: str) -> Dict[str, str]:
+    """
+    Validate a url, raising an exception if it cannot be resolved.
+
+    Args:
+        url: Url to validate.
+
+    Returns:
+        Response headers that can be used to validate the url again using a conditional
+        request.
+    """
+
+    async def _target() -> Dict[str, str]:
+        async with httpx.AsyncClient() as client:
+            return await _validate_url(url, client)
+
+    return asyncio.run(_target())
+
+
+async def _validate_url(
+    url: str, client: httpx.AsyncClient, headers: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Validate a url on an event loop, raising an exception if it cannot be resolved.
+
+    Args:
+        url: Url to validate.
+        client: Client to send requests with.
+        headers: Additional headers, e.g., for conditional requests.
+
+    Returns:
+        Response headers that can be used to validate the url again using a conditional
+        request.
+    """
+    parsed = urlparse(url)
+    if not parsed.hostname:
+        raise httpx.InvalidURL(f"url `{url}` has no hostname")
+    try:
+        kwargs = {
+            "follow_redirects": not parsed.hostname.endswith("doi.org"),
+            "headers": {**HEADERS, **(headers or {})},
+            "timeout": TIMEOUT,
+        }
+        # Only fetch the headers to avoid downloading large documents.
+        response = await client.head(url, **kwargs)
+        if response.status_code in HEAD_UNSUPPORTED_STATUS_CODES:
+            # Fall back to a streaming `GET` request without reading the body.
+            async with client.stream("GET", url, **kwargs) as response:
+                pass
+        # Unlike `requests`, `httpx` considers unfollowed redirects to be errors.
+        if response.is_error:
+            response.raise_for_status()
+        # We successfully validated the url using httpx.
+        validators = _get_validators(response)
+        if response.status_code == 304:
+            # Not modified responses may omit validators, so we keep the ones we sent.
+            sent = {
+                key: headers[header]
+                for key, header in VALIDATOR_HEADERS.items()
+                if header in (headers or {})
+            }
+            validators = {**sent, **validators}
+        return validators
+    except httpx.HTTPError:
+        # Failed to validate url using `httpx`; trying `curl_cffi` ...
         pass
 
-    # Try to send the request using a browser.
-    browser = mechanize.Browser()
-    browser.addheaders = list(headers.items())
-    browser.set_handle_robots(False)
-    response = browser.open(url)
-    # We might never get here, but just in case ...
-    assert not response.errno  # pragma: no cover
+    # Failures are rare so we run the blocking fallback in a thread rather than
+    # maintaining an asynchronous session.
+    return await asyncio.to_thread(_validate_url_impersonating, url)
+
+
+async def _validate_url_or_error(
+    url: str,
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    cache: Optional[UrlCache],
+    headers: Dict[str, str],
+) -> Tuple[str, Optional[str]]:
+    """
+    Validate a url, returning the url and an error message or :code:`None`.
+    """
+    async with semaphore:
+        try:
+            validators = await _validate_url(url, client, headers)
+        # Malformed urls raise `ValueError` in `urlparse` or `httpx.InvalidURL`.
+        except (
+            httpx.HTTPError,
+            httpx.InvalidURL,
+            curl_requests.RequestsError,
+            ValueError,
+        ) as ex:
+            return url, f"{ex.__class__.__name__}: {ex}"
+    if cache:
+        cache.set(url, validators)
+    return url, None
+
+
+async def _validate_urls(
+    urls: Iterable[str], max_workers: int, cache: Optional[UrlCache]
+) -> Dict[str, Optional[str]]:
+    errors = {}
+    # Limit the number of requests in flight; the event loop multiplexes them on a
+    # single thread.
+    semaphore = asyncio.Semaphore(max_workers)
+    limits = httpx.Limits(max_connections=max_workers)
+    async with httpx.AsyncClient(limits=limits) as client:
+        coros = []
+        for url in set(urls):
+            fresh, headers = cache.get(url) if cache else (False, {})
+            if fresh:
+                errors[url] = None
+            else:
+                coros.append(
+                    _validate_url_or_error(url, client, semaphore, cache, headers)
+                )
+
+        for coro in tqdm.as_completed(coros, desc="checking hyperlinks"):
+            url, error = await coro
+            errors[url] = error
+    return errors
+
+
+def validate_urls(
+    urls: Iterable[str], max_workers: int = 32, cache: Optional[UrlCache] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Validate urls concurrently on an event loop sharing a connection pool.
+
+    Args:
+        urls: Urls to validate.
+        max_workers: Maximum number of concurrent requests.
+        cache: Cache of previously validated urls.
+
+    Returns:
+        Mapping from each url to an error message or :code:`None` if the url is valid.
+    """
+    return asyncio.run(_validate_urls(urls, max_workers, cache))
 
 
 class CheckPdfHyperlinks:
@@ -79,47 +350,73 @@ class CheckPdfHyperlinks:
         parser = argparse.ArgumentParser(description=get_first_docstring_paragraph(cls))
         parser = argparse.ArgumentParser()
         parser.add_argument("filenames", nargs="+", type=Path)
+        parser.add_argument(
+            "--max-workers",
+            default=32,
+            help="maximum number of concurrent requests",
+            type=int,
+        )
+        parser.add_argument(
+            "--cache",
+            const=DEFAULT_CACHE_PATH,
+            help="cache validated urls in a database (defaults to "
+            f"`{DEFAULT_CACHE_PATH}` if no path is given)",
+            nargs="?",
+            type=Path,
+        )
+        parser.add_argument(
+            "--cache-ttl",
+            default=7 * 24 * 60 * 60,
+            help="number of seconds after which cached urls are validated again",
+            type=float,
+        )
         args: Args = parser.parse_args(argv)
 
         total_errors = 0
 
-        for filename in args.filenames:
-            pagenumbers_and_urls = set(get_urls(filename))
-            print(f"found {len(pagenumbers_and_urls)} urls in `{filename}`")
-            errors = {}
-            valid_urls = set()
-            for page, url in tqdm(
-                sorted(pagenumbers_and_urls), desc="checking hyperlinks"
-            ):
-                if url in errors:
-                    valid = False
-                elif url in valid_urls:
-                    valid = True
-                else:
-                    try:
-                        validate_url(url)
-                        valid = True
-                        valid_urls.add(url)
-                    except (
-                        requests.HTTPError,
-                        requests.ConnectionError,
-                        URLError,
-                    ) as ex:
-                        errors[url] = f"{ex.__class__.__name__}: {ex}"
-                        valid = False
-                if not valid:
+        # Parse documents in parallel if there is more than one because parsing is
+        # compute-bound.
+        if len(args.filenames) > 1:
+            with ProcessPoolExecutor() as executor:
+                pages_by_url_by_file = list(
+                    executor.map(_get_pages_by_url, args.filenames)
+                )
+        else:
+            pages_by_url_by_file = [_get_pages_by_url(args.filenames[0])]
+        for filename, pages_by_url in zip(args.filenames, pages_by_url_by_file):
+            num_urls = sum(len(pages) for pages in pages_by_url.values())
+            print(f"found {num_urls} urls in `{filename}`")
+
+        # Validate all urls at once so urls shared between documents are only validated
+        # once. The cache is closed even if validation fails.
+        cache = UrlCache(args.cache, args.cache_ttl) if args.cache else None
+        try:
+            results = validate_urls(
+                (url for pages_by_url in pages_by_url_by_file for url in pages_by_url),
+                args.max_workers,
+                cache,
+            )
+        finally:
+            if cache:
+                cache.close()
+
+        for filename, pages_by_url in zip(args.filenames, pages_by_url_by_file):
+            num_urls = sum(len(pages) for pages in pages_by_url.values())
+            errors = {url: results[url] for url in pages_by_url if results[url]}
+            for url in sorted(errors):
+                for page in sorted(pages_by_url[url]):
                     print(
                         f"{colorama.Fore.RED}found invalid url{colorama.Fore.RESET} "
                         f"`{url}` on page {page + 1}: {errors[url]}"
                     )
             if not errors:
                 print(
-                    f"{colorama.Fore.GREEN}all {len(pagenumbers_and_urls)} urls "
+                    f"{colorama.Fore.GREEN}all {num_urls} urls "
                     f"ok{colorama.Fore.RESET} in `{filename}`"
                 )
             else:
                 print(
-                    f"{colorama.Fore.RED}{len(errors)} of {len(pagenumbers_and_urls)} "
+                    f"{colorama.Fore.RED}{len(errors)} of {num_urls} "
                     f"urls are invalid{colorama.Fore.RESET} in `{filename}`"
                 )
                 total_errors += len(errors)
@@ -1,20 +1,30 @@
 import argparse
+import asyncio
+from contextlib import contextmanager
+import mmap
+import os
 from pathlib import Path
 import re
-from tqdm import tqdm
-from typing import List, Optional
+from tqdm.asyncio import tqdm
+from typing import Generator, Iterable, List, Optional, Union
 from .util import get_first_docstring_paragraph, raise_for_missing_modules
 
 
 with raise_for_missing_modules():
-    import requests
+    import httpx
 
 
-BIB_PATTERN = re.compile(r"@\w+\{(.*?),")
-BBL_PATTERN = re.compile(
-    r"(?:\\bibitem(?:\[.*?\])?\{(.*?)\})|(?:\\entry\{(.*?)\})", re.S
-)
-DOI_PATTERN = re.compile(r"doi\s*=\s*\{\s*(.*?)\s*\},")
+# Patterns use negated character classes rather than lazy wildcards to match in linear
+# time. They match bytes so files can be scanned without decoding them.
+BIB_PATTERN = re.compile(rb"@\w+\{\s*([^,\s]+)\s*,")
+BBL_PATTERN = re.compile(rb"\\bibitem(?:\[[^\]]*\])?\{([^}]+)\}|\\entry\{([^}]+)\}")
+DOI_PATTERN = re.compile(rb"doi\s*=\s*\{\s*(.*?)\s*\},")
+# Maximum number of concurrent doi requests.
+MAX_CONNECTIONS = 32
+# Time to wait for a response in seconds.
+TIMEOUT = 10
+# Status codes returned by the doi resolver for registered dois.
+DOI_REDIRECT_STATUS_CODES = {301, 302, 303}
 
 
 class Args:
@@ -23,6 +33,39 @@ class Args:
     check_dois: bool
 
 
+@contextmanager
+def _map_file(path: Path) -> Generator[Union[mmap.mmap, bytes], None, None]:
+    """
+    Map a file to memory for reading without copying its contents.
+    """
+    with path.open("rb") as fp:
+        # Empty files cannot be mapped.
+        if not os.fstat(fp.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+async def _check_doi(client: httpx.AsyncClient, doi: str) -> bool:
+    """
+    Check if a doi can be resolved.
+    """
+    response = await client.head(f"https://doi.org/{doi}", timeout=TIMEOUT)
+    return response.status_code in DOI_REDIRECT_STATUS_CODES
+
+
+async def _check_dois(dois: Iterable[str]) -> List[bool]:
+    """
+    Check if dois can be resolved concurrently using a shared connection pool.
+    """
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(limits=limits) as client:
+        return await tqdm.gather(
+            *(_check_doi(client, doi) for doi in dois), desc="checking dois"
+        )
+
+
 class CheckReferences:
     """
     Check LaTeX documents for missing or unused references.
@@ -45,14 +88,19 @@ class CheckReferences:
         )
         args: Args = parser.parse_args(argv)
 
-        bib = args.bib.read_text()
-        bib_refs = set(BIB_PATTERN.findall(bib))
+        with _map_file(args.bib) as bib:
+            bib_refs = {match.group(1).decode() for match in BIB_PATTERN.finditer(bib)}
+            if args.check_dois:
+                dois = [match.decode() for match in DOI_PATTERN.findall(bib)]
         print(f"found {len(bib_refs)} bib references")
 
         # Check consistency of references if a bbl file is given.
         if args.bbl:
-            bbl = args.bbl.read_text()
-            bbl_refs = set(map(max, BBL_PATTERN.findall(bbl)))
+            with _map_file(args.bbl) as bbl:
+                bbl_refs = {
+                    (match.group(1) or match.group(2)).decode()
+                    for match in BBL_PATTERN.finditer(bbl)
+                }
             print(f"found {len(bbl_refs)} bbl references")
 
             extra = bib_refs - bbl_refs
@@ -71,12 +119,8 @@ class CheckReferences:
 
         # Check dois if desired.
         if args.check_dois:
-            dois = re.findall(DOI_PATTERN, bib)
-            for doi in tqdm(dois, desc="checking dois"):
-                response = requests.get(
-                    f"https://dx.doi.org/{doi}", allow_redirects=False
-                )
-                if response.status_code != 302:
+            for doi, resolved in zip(dois, asyncio.run(_check_dois(dois))):
+                if not resolved:
                     print(f"doi {doi} could not be resolved")
 
 
@@ -10,7 +10,9 @@ with raise_for_missing_modules():
     from scipy import integrate, interpolate
 
 
-def normalize_cdf(cdf: "TensorLike", tol: Optional[float] = None) -> np.ndarray:
+def normalize_cdf(
+    cdf: "TensorLike", tol: Optional[float] = None, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Normalize a cumulative distribution function between 0 and 1 after validation.
 
@@ -20,11 +22,16 @@ def normalize_cdf(cdf: "TensorLike", tol: Optional[float] = None) -> np.ndarray:
             differ from 0 and the last value to differ from 1. Discrepancies may arise,
             for example, due to numerical errors incurred integrating a probability
             distribution function to obtain `cdf`.
+        out: Buffer to write the normalized cumulative distribution function to, e.g.,
+            to avoid allocations when normalizing repeatedly. May be `cdf` itself.
 
     Returns:
         Normalized cumulative distribution function.
     """
-    if np.diff(cdf).min() < 0:
+    cdf = np.asarray(cdf)
+    # Compare neighbors rather than computing differences to avoid a floating point
+    # temporary.
+    if (cdf[1:] < cdf[:-1]).any():
         raise ValueError("`cdf` must be non-decreasing.")
 
     if tol is not None:
@@ -39,8 +46,13 @@ def normalize_cdf(cdf: "TensorLike", tol: Optional[float] = None) -> np.ndarray:
                 f"{cdf[-1]}."
             )
 
-    cdfmin = cdf.min()
-    return (cdf - cdfmin) / (cdf.max() - cdfmin)
+    # The extrema of a non-decreasing `cdf` are its first and last elements.
+    cdfmin = cdf[0]
+    scale = cdf[-1] - cdfmin
+    if out is None:
+        return (cdf - cdfmin) / scale
+    np.subtract(cdf, cdfmin, out=out)
+    return np.divide(out, scale, out=out)
 
 
 def sample_empirical_cdf(
@@ -67,14 +79,19 @@ def sample_empirical_cdf(
     Returns:
         Sample the desired size.
     """
-    if np.diff(x).min() <= 0:
+    x = np.asarray(x)
+    if (x[1:] <= x[:-1]).any():
         raise ValueError("`x` must be strictly increasing.")
 
     random_state = random_state or np.random
-    interpolated = interpolate.interp1d(
-        normalize_cdf(cdf, tol), x, kind=kind, assume_sorted=True
-    )
-    return interpolated(random_state.uniform(size=size))
+    cdf = normalize_cdf(cdf, tol)
+    u = random_state.uniform(size=size)
+    # Use numpy's interpolation for the linear case to avoid the overhead of
+    # constructing an interpolator.
+    if kind == "linear":
+        return np.interp(u, cdf, x)
+    interpolated = interpolate.interp1d(cdf, x, kind=kind, assume_sorted=True)
+    return interpolated(u)
 
 
 def sample_empirical_pdf(
@@ -104,8 +121,6 @@ def sample_empirical_pdf(
     Returns:
         Sample the desired size.
     """
-    # Obtain the empirical CDF; we need to append a zero at the front because
-    # `cumulative_trapezoid` returns `n - 1` elements for `n`-length input.
-    cdf = np.zeros(x.size)
-    cdf[1:] = integrate.cumulative_trapezoid(pdf, x)
+    # Obtain the empirical CDF starting at zero in a single buffer.
+    cdf = integrate.cumulative_trapezoid(pdf, x, initial=0)
     return sample_empirical_cdf(x, cdf, size, kind, random_state, tol)
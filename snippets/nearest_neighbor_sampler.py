@@ -82,7 +82,8 @@ class NearestNeighborSampler(BaseEstimator):
 
         Args:
             data: Data to condition on with shape `(batch_size, n_features)`.
-            **kwargs: Keyword arguments passed to the KDTree query method.
+            **kwargs: Keyword arguments passed to the KDTree query method. Queries are
+                parallelized across all available cores unless `workers` is given.
 
         Returns:
             Dictionary of posterior samples. Each value has shape
@@ -94,6 +95,7 @@ class NearestNeighborSampler(BaseEstimator):
             raise NotFittedError
 
         data = check_array(data)
+        kwargs.setdefault("workers", -1)
         _, idx = self.tree_.query(
             data, k=self.n_samples, p=self.minkowski_norm, **kwargs
         )
@@ -101,7 +103,7 @@ class NearestNeighborSampler(BaseEstimator):
         # is one.
         idx = idx.reshape((*data.shape[:-1], self.n_samples))
 
-        return self.params_[idx]
+        return np.take(self.params_, idx, axis=0)
 
     @property
     def n_samples(self) -> int:
@@ -6,6 +6,8 @@ with raise_for_missing_modules():
 
 
 S = TypeVar("S", bound="StopOnPlateau")
+# Signs that turn minimization and maximization into maximization.
+MODE_SIGNS = {"min": -1.0, "max": 1.0}
 
 
 class StopOnPlateau:
@@ -49,18 +51,50 @@ class StopOnPlateau:
         threshold: float = 1e-4,
         threshold_mode: Literal["rel", "abs"] = "rel",
     ) -> None:
-        self.mode = mode
+        # The comparison settings are read-only because they are folded into the
+        # comparison below.
+        self._mode = mode
         self.patience = patience
-        self.threshold = threshold
-        self.threshold_mode = threshold_mode
-        if self.mode == "min":
-            self.best = float("inf")
-        elif self.mode == "max":
-            self.best = -float("inf")
-        else:
+        self._threshold = threshold
+        self._threshold_mode = threshold_mode
+        if self.mode not in MODE_SIGNS:
             raise ValueError(self.mode)
+        if self.threshold_mode not in {"rel", "abs"}:
+            raise ValueError(self.threshold_mode)
+        # Flip the signs so we only need to compare for maximization. The threshold is
+        # folded into the scale of the best value for relative thresholds and into the
+        # offset for absolute thresholds.
+        self._sign = MODE_SIGNS[self.mode]
+        if self.threshold_mode == "rel":
+            self._best_scale = self._sign + self.threshold
+            self._best_offset = 0.0
+        else:
+            self._best_scale = self._sign
+            self._best_offset = self.threshold
+        self.best = -self._sign * float("inf")
         self.num_bad_epochs = 0
 
+    @property
+    def mode(self) -> str:
+        """
+        Whether the monitored quantity is minimized or maximized.
+        """
+        return self._mode
+
+    @property
+    def threshold(self) -> float:
+        """
+        Threshold for measuring the new optimum.
+        """
+        return self._threshold
+
+    @property
+    def threshold_mode(self) -> str:
+        """
+        Whether the threshold is relative or absolute.
+        """
+        return self._threshold_mode
+
     @property
     def stop(self) -> bool:
         """
@@ -97,16 +131,7 @@ class StopOnPlateau:
         Returns:
             If the candidate is better than the current best value.
         """
-        if self.mode == "min" and self.threshold_mode == "rel":
-            return candidate < best * (1 - self.threshold)
-        elif self.mode == "min" and self.threshold_mode == "abs":
-            return candidate < best - self.threshold
-        elif self.mode == "max" and self.threshold_mode == "rel":
-            return candidate > best * (1 + self.threshold)
-        elif self.mode == "max" and self.threshold_mode == "abs":
-            return candidate > best + self.threshold
-        else:
-            raise ValueError(self.mode, self.threshold_mode)
+        return self._sign * candidate > self._best_scale * best + self._best_offset
 
     @classmethod
     def from_scheduler(
@@ -1,6 +1,7 @@
-from functools import reduce
-from operator import mul
-from typing import Dict, Tuple, TYPE_CHECKING
+from functools import lru_cache
+from itertools import accumulate
+from math import prod
+from typing import Callable, Dict, Tuple, TYPE_CHECKING
 
 
 if TYPE_CHECKING:
@@ -11,6 +12,22 @@ ParamDict = Dict[str, "TensorLike"]
 ShapeDict = Dict[str, Tuple[int]]
 
 
+@lru_cache(maxsize=None)
+def _get_concatenate(cls: type) -> Callable[..., "TensorLike"]:
+    """
+    Get the concatenation function for a tensor type, importing the backend lazily so
+    neither numpy nor torch is required unless used.
+    """
+    if cls.__name__ == "ndarray":
+        import numpy as np
+
+        return np.concatenate
+    else:
+        import torch as th
+
+        return th.concatenate
+
+
 def from_param_dict(params: "ParamDict", shapes: ShapeDict) -> "TensorLike":
     """
     Convert a dictionary of parameters to a tensor of parameters for batch processing.
@@ -63,14 +80,7 @@ def from_param_dict(params: "ParamDict", shapes: ShapeDict) -> "TensorLike":
         value = value.reshape((*batch_shape, -1))
         parts.append(value)
 
-    if value.__class__.__name__ == "ndarray":
-        import numpy as np
-
-        return np.concatenate(parts, axis=-1)
-    else:
-        import torch as th
-
-        return th.concatenate(parts, axis=-1)
+    return _get_concatenate(type(value))(parts, axis=-1)
 
 
 def to_param_dict(params: "TensorLike", shapes: ShapeDict) -> "ParamDict":
@@ -99,21 +109,18 @@ def to_param_dict(params: "TensorLike", shapes: ShapeDict) -> "ParamDict":
     if not shapes:
         raise ValueError("The shape dictionary is empty.")
 
-    size = sum(reduce(mul, shape, 1) for shape in shapes.values())
+    items = sorted(shapes.items())
+    sizes = [prod(shape) for _, shape in items]
+    offsets = accumulate(sizes, initial=0)
+    size = sum(sizes)
     if params.shape[-1] != size:
         raise ValueError(
             f"Expected {size} elements based on shape dictionary; got "
             f"{params.shape[-1]}"
         )
 
-    parts = {}
-    offset = 0
     batch_shape = params.shape[:-1]
-    for param, shape in sorted(shapes.items()):
-        size = reduce(mul, shape, 1)
-        parts[param] = params[..., offset : offset + size].reshape(
-            (*batch_shape, *shape)
-        )
-        offset += size
-
-    return parts
+    return {
+        param: params[..., offset : offset + size].reshape((*batch_shape, *shape))
+        for (param, shape), offset, size in zip(items, offsets, sizes)
+    }
@@ -1,4 +1,7 @@
 import collections
+import functools
+import itertools
+import math
 import string
 from typing import Dict, Iterable, List, Literal, Optional, Tuple, Union
 from .util import raise_for_missing_modules
@@ -13,6 +16,7 @@ with raise_for_missing_modules():
     from matplotlib.path import Path
     from matplotlib import pyplot as plt
     from matplotlib.text import Text
+    from matplotlib.transforms import Transform
     import numpy as np
 
 
@@ -25,6 +29,7 @@ def plot_band(
     lower: float = 0.05,
     center: float = 0.5,
     upper: float = 0.95,
+    presorted: bool = False,
     **kwargs,
 ) -> Tuple[Line2D, PolyCollection]:
     """
@@ -38,6 +43,8 @@ def plot_band(
         lower: Quantile of the lower edge of the shaded band.
         center: Quantile of the central line.
         upper: Quantile of the upper edge of the shaded band.
+        presorted: Whether :code:`ys` is already sorted along the first axis, e.g., by
+            :code:`np.sort(ys, axis=0)`, to reuse the sort for multiple bands.
         ax: Axes to use for plotting (defaults to :func:`matplotlib.pyplot.gca`).
         **kwargs: Keyword arguments passed to :func:`matplotlib.axes.Axes.plot` for
             plotting the central line.
@@ -54,7 +61,16 @@ def plot_band(
             plot_band(x, ys)
     """
     ax = ax or plt.gca()
-    lower_, center_, upper_ = np.quantile(ys, [lower, center, upper], axis=0)
+    if presorted:
+        # Interpolate linearly between order statistics like `np.quantile` does.
+        ys = np.asarray(ys)
+        index = np.asarray([lower, center, upper]) * (len(ys) - 1)
+        below = np.floor(index).astype(int)
+        above = np.minimum(below + 1, len(ys) - 1)
+        frac = (index - below)[:, None]
+        lower_, center_, upper_ = (1 - frac) * ys[below] + frac * ys[above]
+    else:
+        lower_, center_, upper_ = np.quantile(ys, [lower, center, upper], axis=0)
     (line,) = ax.plot(x, center_, **kwargs)
     fill = ax.fill_between(x, lower_, upper_, alpha=(line.get_alpha() or 1.0) * ralpha)
     return line, fill
@@ -75,7 +91,8 @@ def rounded_path(
         radius: Radius of rounded corners.
         shrink: Amount to shrink the beginning and end of the path by.
         closed: Close the path.
-        readonly: Make the path readonly.
+        readonly: Make the path readonly. Readonly paths are cached so calls with
+            identical arguments return the same path.
 
     Returns:
         Path with rounded corners.
@@ -106,31 +123,57 @@ def rounded_path(
             fig.tight_layout()
     """
     vertices = np.asarray(vertices, dtype=float)
+    if readonly:
+        return _rounded_path_cached(
+            vertices.tobytes(), vertices.shape, radius, shrink, closed
+        )
+    return _rounded_path(vertices, radius, shrink, closed, readonly)
+
+
+@functools.lru_cache(maxsize=512)
+def _rounded_path_cached(
+    vertices: bytes, shape: Tuple[int, ...], radius: float, shrink: float, closed: bool
+) -> Path:
+    vertices = np.frombuffer(vertices).reshape(shape)
+    return _rounded_path(vertices, radius, shrink, closed, True)
+
+
+def _rounded_path(
+    vertices: np.ndarray, radius: float, shrink: float, closed: bool, readonly: bool
+) -> Path:
     if len(vertices) < 2:
         raise ValueError(f"at least two vertices are required; got {len(vertices)}")
-    parts = []
-    for i, vertex in enumerate(vertices):
-        # Calculate the unit vector from the current to the next point.
-        next = vertices[i + 1]
-        forward = next - vertex
-        distance = np.linalg.norm(forward)
-        forward /= distance
-        # Move to starting point.
-        if i == 0:
-            parts.append((vertex + shrink * forward, Path.MOVETO))
-        # Add the control point and beginning of the next straight segment.
-        if i > 0:
-            parts.append((vertex, Path.CURVE3))
-            parts.append((vertex + min(radius, distance / 2) * forward, Path.CURVE3))
-        # Until the last point, add the start of the next curve.
-        if i < len(vertices) - 2:
-            parts.append((next - min(radius, distance / 2) * forward, Path.LINETO))
-        # Line to the end point.
-        if i == len(vertices) - 2:
-            parts.append((next - shrink * forward, Path.LINETO))
-            break
-
-    return Path(*zip(*parts), closed=closed, readonly=readonly)
+    # Calculate unit vectors along each segment and the radii of rounded corners.
+    forward = np.diff(vertices, axis=0)
+    distance = np.sqrt(np.einsum("ij,ij->i", forward, forward))
+    if not distance.all():
+        raise ValueError("consecutive vertices must not coincide")
+    forward /= distance[:, None]
+
+    # A single segment has no corners to round so we only need to shrink its ends.
+    if len(vertices) == 2:
+        points = vertices + np.outer([shrink, -shrink], forward[0])
+        return Path(
+            points, [Path.MOVETO, Path.LINETO], closed=closed, readonly=readonly
+        )
+
+    radii = np.minimum(radius, distance / 2)[:, None]
+
+    # Each interior vertex contributes the end of the preceding straight segment, the
+    # control point of the curve, and the beginning of the next straight segment.
+    inner = vertices[1:-1]
+    points = np.empty((3 * len(vertices) - 4, 2))
+    points[0] = vertices[0] + shrink * forward[0]
+    points[1:-1:3] = inner - radii[:-1] * forward[:-1]
+    points[2:-1:3] = inner
+    points[3:-1:3] = inner + radii[1:] * forward[1:]
+    points[-1] = vertices[-1] - shrink * forward[-1]
+
+    codes = np.full(len(points), Path.CURVE3, dtype=Path.code_type)
+    codes[0] = Path.MOVETO
+    codes[1::3] = Path.LINETO
+
+    return Path(points, codes, closed=closed, readonly=readonly)
 
 
 def label_axes(
@@ -172,7 +215,7 @@ def label_axes(
     elif isinstance(labels, str):
         labels = [labels]
     if label_offset is not None:
-        labels = labels[label_offset:]
+        labels = itertools.islice(labels, label_offset, None)
     if isinstance(offset, float):
         xfactor = yfactor = offset
     else:
@@ -193,18 +236,25 @@ Point.x.__doc__ = "Horizontal coordinate."
 Point.y.__doc__ = "Vertical coordinate."
 
 
-def get_anchor(artist: Union[Artist, Text], hour: float) -> Point:
+def get_anchors(
+    artist: Union[Artist, Text],
+    hours: np.ndarray,
+    inverse: Optional[Transform] = None,
+) -> np.ndarray:
     """
-    Get an anchor on the boundary of an artist at the given "hour".
+    Get anchors on the boundary of an artist at the given "hours".
 
     Args:
-        artist: Artist on whose boundary to get an anchor. If a
+        artist: Artist on whose boundary to get anchors. If a
             :class:`~matplotlib.text.Text` instance and it has a bounding box patch, the
             bounding box patch is used.
-        hour: Direction of the anchor as the hour on a 12-hour clock.
+        hours: Directions of the anchors as hours on a 12-hour clock.
+        inverse: Inverse of the data transform of the artist's axes, e.g., to avoid
+            inverting the transform repeatedly for many artists (defaults to
+            :code:`artist.axes.transData.inverted()`).
 
     Returns:
-        Location of the anchor.
+        Locations of the anchors with shape :code:`(*hours.shape, 2)`.
 
     .. note::
 
@@ -217,7 +267,7 @@ def get_anchor(artist: Union[Artist, Text], hour: float) -> Point:
 
             from matplotlib import pyplot as plt
             import numpy as np
-            from snippets.plot import get_anchor
+            from snippets.plot import get_anchors
 
             # Add some text to the plot.
             fig, ax = plt.subplots()
@@ -236,8 +286,8 @@ def get_anchor(artist: Union[Artist, Text], hour: float) -> Point:
             # Find the anchors at different positions and plot them.
             hours = np.arange(12)
             for text in texts:
-                anchors = [get_anchor(text, hour) for hour in hours]
-                ax.scatter(*np.transpose(anchors), c=hours, zorder=9)
+                anchors = get_anchors(text, hours)
+                ax.scatter(*anchors.T, c=hours, zorder=9)
     """
     ax = artist.axes
     if isinstance(artist, Text):
@@ -248,16 +298,62 @@ def get_anchor(artist: Union[Artist, Text], hour: float) -> Point:
     x = xmin + width / 2
     y = ymin + height / 2
 
-    # Determine the displacement vector.
-    angle = 2 * np.pi * hour / 12
+    # Determine the displacement vectors.
+    hours = np.asarray(hours, dtype=float)
+    angle = 2 * np.pi * hours / 12
     dx = np.sin(angle)
     dy = np.cos(angle)
-    scale = 1 / (2 * max(abs(dy) / height, abs(dx) / width))
-    point = x + scale * dx, y + scale * dy
+    scale = 1 / (2 * np.maximum(np.abs(dy) / height, np.abs(dx) / width))
+    points = np.stack([x + scale * dx, y + scale * dy], axis=-1)
 
     # Transform to the data coordinate system.
-    point = ax.transData.inverted().transform(point)
-    return Point(*point)
+    inverse = inverse or ax.transData.inverted()
+    return inverse.transform(points.reshape((-1, 2))).reshape(points.shape)
+
+
+def get_anchor(
+    artist: Union[Artist, Text], hour: float, inverse: Optional[Transform] = None
+) -> Point:
+    """
+    Get an anchor on the boundary of an artist at the given "hour".
+
+    Args:
+        artist: Artist on whose boundary to get an anchor. If a
+            :class:`~matplotlib.text.Text` instance and it has a bounding box patch, the
+            bounding box patch is used.
+        hour: Direction of the anchor as the hour on a 12-hour clock.
+        inverse: Inverse of the data transform of the artist's axes, e.g., to avoid
+            inverting the transform repeatedly when getting many anchors (defaults to
+            :code:`artist.axes.transData.inverted()`).
+
+    Returns:
+        Location of the anchor.
+
+    .. note::
+
+        :meth:`matplotlib.Figure.draw_without_rendering` may need to be called for
+        extents of artists to be calculated correctly. Use :func:`.get_anchors` to get
+        many anchors at once.
+
+    Example:
+
+        .. plot::
+
+            from matplotlib import pyplot as plt
+            from snippets.plot import get_anchor
+
+            # Add some text to the plot.
+            fig, ax = plt.subplots()
+            text = ax.text(0.5, 0.5, "hello", fontsize=40, ha="center", va="center")
+
+            # Draw without rendering ensures the extent of all artists is computed.
+            fig.draw_without_rendering()
+
+            # Point to the anchor at five o'clock.
+            anchor = get_anchor(text, 5)
+            ax.annotate("", anchor, (0.8, 0.2), arrowprops={"arrowstyle": "->"})
+    """
+    return Point(*get_anchors(artist, hour, inverse))
 
 
 def arrow_path(
@@ -294,17 +390,22 @@ def arrow_path(
             ax.add_patch(PathPatch(arrow, fc="C1"))
             ax.set_aspect("equal")
     """
-    width = 2 * length / np.sqrt(3) if width is None else width
-    *_, a, b = reversed(path.vertices) if backward else path.vertices
-    delta = b - a
-    delta /= np.linalg.norm(delta)
-    orth = delta[::-1] * [-1, 1]
-    vertices = [
-        b,
-        b - length * delta + width / 2 * orth,
-        b - length * delta - width / 2 * orth,
-        b,
-    ]
+    width = 2 * length / math.sqrt(3) if width is None else width
+    (xa, ya), (xb, yb) = path.vertices[[1, 0]] if backward else path.vertices[-2:]
+    # Use scalar arithmetic because numpy overhead dominates for two-vectors.
+    dx = xb - xa
+    dy = yb - ya
+    distance = math.hypot(dx, dy)
+    if not distance:
+        raise ValueError(
+            "the segment the arrow is attached to must have non-zero length"
+        )
+    # Find the base of the arrow and the offset from its center to its corners.
+    xc = xb - length * dx / distance
+    yc = yb - length * dy / distance
+    xo = -width / 2 * dy / distance
+    yo = width / 2 * dx / distance
+    vertices = np.array([(xb, yb), (xc + xo, yc + yo), (xc - xo, yc - yo), (xb, yb)])
     return Path(
         vertices, [Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], closed=True
     )
@@ -361,16 +462,30 @@ def dependence_heatmap(
 
     # Estimate dependence and limits for the colormap.
     if method == "corrcoef":
-        dependence = np.corrcoef(stacked.T)
+        # Standardize before casting to single precision so large offsets do not lose
+        # precision; the matrix product dominates and is cheaper in single precision.
+        standardized = (stacked - stacked.mean(axis=0)) / stacked.std(axis=0)
+        standardized = standardized.astype(np.float32)
+        dependence = standardized.T @ standardized / len(standardized)
+        np.clip(dependence, -1, 1, out=dependence)
         np.fill_diagonal(dependence, np.nan)
 
-        vmax = kwargs.setdefault("vmax", np.nanmax(np.abs(dependence)))
+        # Two reductions avoid allocating the absolute value of the whole matrix.
+        vmax = max(np.nanmax(dependence), -np.nanmin(dependence))
+        vmax = kwargs.setdefault("vmax", vmax)
         kwargs.setdefault("vmin", -vmax)
         kwargs.setdefault("cmap", "coolwarm")
     elif method == "nmi":
         with raise_for_missing_modules():
+            from joblib import delayed, Parallel
             from sklearn.feature_selection import mutual_info_regression
-        dependence = np.asarray([mutual_info_regression(stacked, x) for x in stacked.T])
+        # Estimate mutual information for each target in parallel using threads because
+        # the nearest neighbor queries release the global interpreter lock.
+        dependence = np.asarray(
+            Parallel(n_jobs=-1, prefer="threads")(
+                delayed(mutual_info_regression)(stacked, x) for x in stacked.T
+            )
+        )
         diag = np.diag(dependence)
         dependence /= (diag[:, None] + diag) / 2
         np.fill_diagonal(dependence, np.nan)
@@ -382,11 +497,13 @@ def dependence_heatmap(
 
     # Add lines and labels.
     sizes = np.asarray([value[0].size for value in samples.values()])
-    locs = np.cumsum(sizes) - (sizes + 1) / 2
+    edges = np.cumsum(sizes)
+    locs = edges - (sizes + 1) / 2
 
     if lines:
+        # The last edge coincides with the border of the image so we skip it.
         for axxline in [ax.axhline, ax.axvline]:
-            for loc in np.cumsum(sizes):
+            for loc in edges[:-1]:
                 axxline(loc - 1 / 2, color="gray", ls=":")
 
     if labels:
@@ -469,16 +586,20 @@ def parameterization_mutual_info(
             fig.tight_layout()
     """
     with raise_for_missing_modules():
+        from joblib import delayed, Parallel
         from sklearn.feature_selection import mutual_info_regression
 
     ax = ax or plt.gca()
 
     x = np.asarray(x).reshape((len(x), -1))
-    # Evaluate the non-centered parameter.
-    z = x / np.asarray(scale)[:, None]
+    # Evaluate the non-centered parameter, dividing once per sample rather than once
+    # per element.
+    z = x * (1 / np.asarray(scale, dtype=float))[:, None]
 
-    mix = mutual_info_regression(x, scale)
-    miz = mutual_info_regression(z, scale)
+    # Estimate both mutual informations concurrently (see `dependence_heatmap`).
+    mix, miz = Parallel(n_jobs=2, prefer="threads")(
+        delayed(mutual_info_regression)(value, scale) for value in [x, z]
+    )
     pts = ax.scatter(mix, miz, **kwargs)
     mm = mix.min(), mix.max()
     ax.plot(mm, mm, color="k", ls=":")
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from itertools import product
 from typing import Optional, Union
 
 from .util import raise_for_missing_modules
@@ -14,6 +13,78 @@ with raise_for_missing_modules():
     from sklearn.utils import check_array
 
 
+# Maximum number of elements of the dense temporary used to evaluate univariate kernel
+# density estimates in chunks, bounding memory independently of the training set size.
+UNIVARIATE_CHUNK_ELEMENTS = 2**16
+
+
+def _kde_logpdf(kde: gaussian_kde, points: np.ndarray) -> np.ndarray:
+    """
+    Evaluate the log probability of a kernel density estimate at points with shape
+    :code:`(n_features, n_samples)`. Univariate estimates are evaluated densely in
+    chunks which is faster than scipy's general quadratic form. Each chunk comprises
+    as many points as fit in :data:`UNIVARIATE_CHUNK_ELEMENTS` pairwise differences.
+    """
+    if kde.d != 1:
+        return kde.logpdf(points)
+
+    scale = np.sqrt(kde.covariance[0, 0])
+    log_weights = np.log(kde.weights) - np.log(scale) - np.log(2 * np.pi) / 2
+    points = points[0]
+    result = np.empty(points.size)
+    chunk_size = max(1, UNIVARIATE_CHUNK_ELEMENTS // kde.n)
+    for offset in range(0, points.size, chunk_size):
+        chunk = slice(offset, offset + chunk_size)
+        z = points[chunk, None] - kde.dataset[0]
+        z /= scale
+        z *= z
+        z *= -0.5
+        z += log_weights
+        result[chunk] = logsumexp(z, axis=1)
+    return result
+
+
+def _get_reflection_offsets(bounds: np.ndarray) -> np.ndarray:
+    """
+    Build a table of offsets with one row per reflection and shape
+    :code:`(n_reflections, n_features, 1)`. Each feature is either left as-is
+    (indicated by :code:`nan`) or reflected at one of its finite bounds. Non-finite
+    bounds are dropped so the identity is only included once.
+    """
+    options = [[np.nan, *bound[np.isfinite(bound)]] for bound in bounds]
+    grid = np.meshgrid(*options, indexing="ij")
+    return np.stack(grid, axis=-1).reshape((-1, len(options), 1))
+
+
+def _evaluate_reflected_kde_logpdf(
+    kde: gaussian_kde, X: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    """
+    Evaluate the log probability of a kernel density estimate summed over reflections
+    given by a table of offsets (see :func:`_get_reflection_offsets`).
+    """
+    reflected = np.where(np.isnan(offsets), X, 2 * offsets - X)
+
+    # Evaluate all reflections in a single call to amortize the per-call overhead.
+    n_reflections = len(reflected)
+    scores = _kde_logpdf(kde, reflected.transpose(1, 0, 2).reshape((kde.d, -1)))
+    scores = scores.reshape((n_reflections, -1))
+
+    # A single finite bound gives two reflections which the ufunc combines directly.
+    if n_reflections == 2:
+        return np.logaddexp(*scores)
+
+    # Evaluate the log-sum-exp in place. Like scipy's implementation, we only subtract
+    # finite maxima so samples with zero density evaluate to -inf rather than nan.
+    maxima = scores.max(axis=0)
+    maxima[~np.isfinite(maxima)] = 0
+    scores -= maxima
+    np.exp(scores, out=scores)
+    # Samples with zero density have a vanishing sum; -inf is the expected result.
+    with np.errstate(divide="ignore"):
+        return np.log(scores.sum(axis=0)) + maxima
+
+
 def evaluate_bounded_kde_logpdf(
     kde: gaussian_kde, X: np.ndarray, bounds: np.ndarray
 ) -> np.ndarray:
@@ -62,18 +133,7 @@ def evaluate_bounded_kde_logpdf(
         kde.d
     ), f"Expected shape (n_features={kde.d}, n_samples=...) for `X` but got {X.shape}."
 
-    reflections = [(lower, None, upper) for (lower, upper) in bounds]
-    scores = []
-    for reflection in product(*reflections):
-        reflected = []
-        for x, bound in zip(X, reflection):
-            # Apply the reflection.
-            if bound is not None and np.isfinite(bound):
-                x = 2 * bound - x
-            reflected.append(x)
-
-        scores.append(kde.logpdf(reflected))
-    return logsumexp(scores, axis=0)
+    return _evaluate_reflected_kde_logpdf(kde, X, _get_reflection_offsets(bounds))
 
 
 class GaussianKernelDensity(BaseEstimator):
@@ -157,6 +217,12 @@ class GaussianKernelDensity(BaseEstimator):
             "dimensions."
         )
         self.kde_ = gaussian_kde(X.T, self.bandwidth, sample_weight)
+        # Build the reflection table once because the bounds are fixed after fitting.
+        # There is nothing to reflect if none of the bounds are finite.
+        if self.bounds is None or not np.isfinite(self.bounds).any():
+            self.reflection_offsets_ = None
+        else:
+            self.reflection_offsets_ = _get_reflection_offsets(self.bounds)
         return self
 
     def _ensure_fitted(self) -> None:  # pragma: no cover
@@ -195,10 +261,10 @@ class GaussianKernelDensity(BaseEstimator):
             f"{X.shape[1]}."
         )
 
-        # Return the estimate as-is if no bounds are specified.
-        if self.bounds is None:
-            return self.kde_.logpdf(X.T)
-        return evaluate_bounded_kde_logpdf(self.kde_, X.T, self.bounds)
+        # Return the estimate as-is if there are no finite bounds to reflect at.
+        if self.reflection_offsets_ is None:
+            return _kde_logpdf(self.kde_, X.T)
+        return _evaluate_reflected_kde_logpdf(self.kde_, X.T, self.reflection_offsets_)
 
     def score(self, X: np.ndarray, y: None = None) -> float:
         """
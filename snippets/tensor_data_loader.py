@@ -1,4 +1,5 @@
 import math
+from typing import Optional, Tuple
 from .util import raise_for_missing_modules
 
 with raise_for_missing_modules():
@@ -20,6 +21,9 @@ class TensorDataLoader:
         dataset: Dataset to load from.
         batch_size: Number of samples per batch.
         shuffle: Shuffle dataset before batching.
+        pin_memory: Copy tensors into pinned memory before batching to speed up
+            transfers to accelerators. Only tensors on the cpu are pinned.
+        device: Device to move batches to, asynchronously if memory is pinned.
 
     Example:
 
@@ -41,25 +45,54 @@ class TensorDataLoader:
         dataset: torch.utils.data.TensorDataset,
         batch_size: int = 1,
         shuffle: bool = False,
+        pin_memory: bool = False,
+        device: Optional[torch.device] = None,
     ) -> None:
         self.dataset = dataset
         self.batch_size = batch_size
         self.shuffle = shuffle
+        self.pin_memory = pin_memory
+        self.device = device
+        # Pinned copies of the dataset tensors for unshuffled iteration.
+        self._pinned_tensors: Optional[Tuple[torch.Tensor, ...]] = None
+
+    def _should_pin(self, x: torch.Tensor) -> bool:
+        """
+        Check if a tensor should be pinned, i.e., pinning is requested and it is on the
+        cpu. Tensors on accelerators cannot be pinned.
+        """
+        return self.pin_memory and x.device.type == "cpu"
 
     def __len__(self) -> int:
         return math.ceil(len(self.dataset) / self.batch_size)
 
     def __iter__(self):
         n = len(self.dataset)
-        permutation = torch.randperm(n) if self.shuffle else None
-        offset = 0
-        while offset < n:
-            yield tuple(
-                (
-                    x[permutation[offset : offset + self.batch_size]]
-                    if self.shuffle
-                    else x[offset : offset + self.batch_size]
+        tensors = self.dataset.tensors
+        if self.shuffle:
+            # Gather the shuffled tensors once so each batch is a contiguous view. The
+            # gather writes straight to pinned memory if requested.
+            permutation = torch.randperm(n)
+            tensors = tuple(
+                torch.index_select(
+                    x,
+                    0,
+                    permutation.to(x.device),
+                    out=torch.empty_like(x, pin_memory=self._should_pin(x)),
                 )
-                for x in self.dataset.tensors
+                for x in tensors
             )
-            offset += self.batch_size
+        elif self.pin_memory:
+            # Pin the dataset once instead of copying it every epoch.
+            if self._pinned_tensors is None:
+                self._pinned_tensors = tuple(
+                    x.pin_memory() if self._should_pin(x) else x for x in tensors
+                )
+            tensors = self._pinned_tensors
+        for offset in range(0, n, self.batch_size):
+            batch = tuple(x[offset : offset + self.batch_size] for x in tensors)
+            if self.device is not None:
+                batch = tuple(
+                    x.to(self.device, non_blocking=self.pin_memory) for x in batch
+                )
+            yield batch
@@ -20,22 +20,26 @@ class Timer:
             1...
     """
 
+    __slots__ = ("start", "end")
+
     def __init__(self) -> None:
-        self.start: Optional[float] = None
-        self.end: Optional[float] = None
+        # Start and end as nanoseconds of the monotonic performance counter.
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
 
     def __enter__(self) -> Timer:
-        self.start = time.time()
+        self.start = time.perf_counter_ns()
         return self
 
     def __exit__(self, *args) -> None:
-        self.end = time.time()
+        self.end = time.perf_counter_ns()
 
     @property
     def duration(self) -> float:
         """
-        Duration for which the timer was active.
+        Duration in seconds for which the timer was active.
         """
-        if not self.start:
+        if self.start is None:
             raise RuntimeError("timer has not started")
-        return (self.end or time.time()) - self.start
+        end = time.perf_counter_ns() if self.end is None else self.end
+        return (end - self.start) / 1e9
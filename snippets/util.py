@@ -26,6 +26,8 @@ class raise_for_missing_modules:
             RuntimeError: install module `xxx` to use the snippet at `...`
     """
 
+    __slots__ = ()
+
     def __enter__(self) -> None:
         pass
 
@@ -51,5 +53,5 @@ def get_first_docstring_paragraph(obj: Any) -> str:
     doc: Optional[str] = getattr(obj, "__doc__", None)
     if not doc:
         raise ValueError(f"{obj} does not have a docstring")
-    doc, *_ = doc.split("\n\n")
+    doc, _, _ = doc.partition("\n\n")
     return textwrap.dedent(doc).strip().replace("\n", " ")
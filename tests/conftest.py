@@ -0,0 +1,8 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    # Seed a fresh generator for each test so random inputs do not depend on test order.
+    return np.random.default_rng(0)
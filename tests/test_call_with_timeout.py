@@ -1,17 +1,22 @@
 import multiprocessing
+from multiprocessing.connection import Connection
+import os
 from pathlib import Path
-import psutil
 import pytest
 from snippets.call_with_timeout import _wrapper, call_with_timeout, ZombieProcessError
+import signal
 import subprocess
+import sys
+import threading
 import time
 from typing import List, Optional
 from unittest import mock
 
 
-def test_timeout_expired() -> None:
+@pytest.mark.parametrize("isolate", [False, True])
+def test_timeout_expired(isolate: bool) -> None:
     with pytest.raises(TimeoutError):
-        call_with_timeout(1, time.sleep, 2)
+        call_with_timeout(1, time.sleep, 2, isolate=isolate)
 
 
 def _target(x: int, error: Optional[Exception] = None) -> int:
@@ -20,29 +25,38 @@ def _target(x: int, error: Optional[Exception] = None) -> int:
     return x + 5
 
 
-def test_timeout_met() -> None:
-    assert call_with_timeout(1, _target, 37) == 42
+@pytest.mark.parametrize("isolate", [False, True])
+def test_timeout_met(isolate: bool) -> None:
+    assert call_with_timeout(1, _target, 37, isolate=isolate) == 42
 
 
-def test_timeout_met_with_error() -> None:
+@pytest.mark.parametrize("isolate", [False, True])
+def test_timeout_met_with_error(isolate: bool) -> None:
     with pytest.raises(RuntimeError, match="custom value error"):
-        call_with_timeout(1, _target, 9, ValueError("custom value error"))
+        call_with_timeout(
+            1, _target, 9, ValueError("custom value error"), isolate=isolate
+        )
 
 
 def test_wrapper() -> None:
-    queue = multiprocessing.Queue()
-    _wrapper(queue, _target, 3)
-    assert queue.get() == (True, 8)
+    connection, child_connection = multiprocessing.Pipe()
+    _wrapper(child_connection.send, _target, 3)
+    assert connection.recv() == (True, 8)
 
     ex = ValueError("foo")
-    _wrapper(queue, _target, 3, error=ex)
-    success, (ex_recovered, tb) = queue.get()
+    _wrapper(child_connection.send, _target, 3, error=ex)
+    success, (ex_recovered, tb) = connection.recv()
     assert not success
     # These are not the same object because the exception has been pickled; we compare
     # the message.
     assert str(ex_recovered) == str(ex)
 
 
+def test_worker_exited() -> None:
+    with pytest.raises(RuntimeError, match="exited unexpectedly"):
+        call_with_timeout(1, os._exit, 1, isolate=True)
+
+
 @pytest.fixture
 def binary_path() -> Path:
     # Compile the binary and yield the path.
@@ -64,7 +78,7 @@ def binary_path() -> Path:
 
 def test_subprocess_success(binary_path: Path) -> None:
     process: subprocess.CompletedProcess = call_with_timeout(
-        1, subprocess.run, [binary_path, "foobar"]
+        1, subprocess.run, [binary_path, "foobar"], isolate=True
     )
     assert process.returncode == 42
 
@@ -72,7 +86,7 @@ def test_subprocess_success(binary_path: Path) -> None:
 def test_subprocess(binary_path: Path) -> None:
     # Make sure we raise a timeout error due to the infinite while loop.
     with pytest.raises(TimeoutError):
-        call_with_timeout(1, subprocess.check_call, [binary_path])
+        call_with_timeout(1, subprocess.check_call, [binary_path], isolate=True)
 
 
 def test_subprocess_ignoring_sigterm(binary_path: Path) -> None:
@@ -80,18 +94,79 @@ def test_subprocess_ignoring_sigterm(binary_path: Path) -> None:
     with mock.patch("snippets.call_with_timeout.JOIN_TIMEOUT", 1), pytest.raises(
         TimeoutError
     ):
-        call_with_timeout(1, subprocess.check_call, [binary_path, "SIGTERM"])
+        call_with_timeout(
+            1, subprocess.check_call, [binary_path, "SIGTERM"], isolate=True
+        )
 
 
 def test_subprocess_ignoring_sigterm_zombie(binary_path: Path) -> None:
     # Make sure we raise a timeout error due to the infinite while loop.
-    processes: List[psutil.Process] = []
+    killpg = os.killpg
+    groups: List[int] = []
+
+    def _killpg(pgid: int, signum: int) -> None:
+        # Record instead of sending kill signals.
+        if signum == signal.SIGKILL:
+            groups.append(pgid)
+        else:
+            killpg(pgid, signum)
+
     with mock.patch("snippets.call_with_timeout.JOIN_TIMEOUT", 0.5), mock.patch(
-        "psutil.Process.kill", processes.append
+        "os.killpg", _killpg
     ), pytest.raises(ZombieProcessError):
-        call_with_timeout(1, subprocess.check_call, [binary_path, "SIGTERM"])
-    assert len(processes) == 1
-    # Kill the process because we didn't due to the patch.
-    for process in processes:
-        process.kill()
-    psutil.wait_procs(processes, 1)
+        call_with_timeout(
+            1, subprocess.check_call, [binary_path, "SIGTERM"], isolate=True
+        )
+    assert len(groups) == 1
+    # Kill the processes because we didn't due to the patch.
+    for pgid in groups:
+        killpg(pgid, signal.SIGKILL)
+    time.sleep(0.5)
+
+
+def test_worker_reused() -> None:
+    pid = call_with_timeout(1, os.getpid, isolate=True)
+    assert pid != os.getpid()
+    assert call_with_timeout(1, os.getpid, isolate=True) == pid
+
+    # The worker is replaced after a timeout.
+    with pytest.raises(TimeoutError):
+        call_with_timeout(1, time.sleep, 2, isolate=True)
+    assert call_with_timeout(1, os.getpid, isolate=True) != pid
+
+
+def test_worker_interrupted() -> None:
+    # Interrupt the call while the worker is still evaluating the target.
+    with mock.patch.object(
+        Connection, "poll", side_effect=KeyboardInterrupt
+    ), pytest.raises(KeyboardInterrupt):
+        call_with_timeout(1, _target, 1, isolate=True)
+    # The next call must not receive the stale response.
+    assert call_with_timeout(1, _target, 2, isolate=True) == 7
+
+
+def test_worker_restarted_for_late_target() -> None:
+    pid = call_with_timeout(1, os.getpid, isolate=True)
+
+    # Define a target the worker does not know about because it was forked earlier.
+    def _late_target() -> int:
+        return os.getpid()
+
+    module = sys.modules[__name__]
+    _late_target.__qualname__ = "_late_target"
+    with mock.patch.object(module, "_late_target", _late_target, create=True):
+        late_pid = call_with_timeout(1, _late_target, isolate=True)
+    assert late_pid not in {pid, os.getpid()}
+
+
+def test_worker_lock_counts_toward_timeout() -> None:
+    thread = threading.Thread(
+        target=call_with_timeout, args=(1, time.sleep, 0.5), kwargs={"isolate": True}
+    )
+    thread.start()
+    time.sleep(0.1)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        call_with_timeout(0.1, os.getpid, isolate=True)
+    assert time.monotonic() - start < 0.3
+    thread.join()
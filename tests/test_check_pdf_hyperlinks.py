@@ -1,6 +1,14 @@
+import asyncio
 import colorama
+from curl_cffi import CurlECode, requests as curl_requests
+import functools
+import httpx
+from pathlib import Path
+import pypdf
+from pypdf.generic import ArrayObject, DictionaryObject, NameObject, TextStringObject
 import pytest
 from snippets import check_pdf_hyperlinks
+from unittest import mock
 
 
 def remove_colors(text: str) -> str:
@@ -26,3 +34,208 @@ def test_check_pdf_hyperlinks_ok(capsys: pytest.CaptureFixture) -> None:
     out, _ = capsys.readouterr()
     out = remove_colors(out)
     assert "all 1 urls in out"
+
+
+def test_validate_url_head_unsupported() -> None:
+    methods = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        methods.append(request.method)
+        return httpx.Response(405 if request.method == "HEAD" else 200)
+
+    async def target() -> None:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await check_pdf_hyperlinks._validate_url("https://example.com", client)
+
+    asyncio.run(target())
+    # We should fall back to a `GET` request.
+    assert methods == ["HEAD", "GET"]
+
+
+def test_validate_url() -> None:
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200, headers={"ETag": '"abc"'})
+    )
+    client_cls = functools.partial(httpx.AsyncClient, transport=transport)
+    with mock.patch.object(httpx, "AsyncClient", client_cls):
+        validators = check_pdf_hyperlinks.validate_url("https://example.com")
+    assert validators == {"ETag": '"abc"'}
+
+
+@pytest.mark.parametrize("aborted", [False, True])
+def test_validate_url_impersonating(aborted: bool) -> None:
+    response = mock.Mock(headers={"ETag": '"abc"', "Content-Type": "text/html"})
+    # Responses with a body abort the transfer and are attached to the error.
+    kwargs = (
+        {
+            "side_effect": curl_requests.RequestsError(
+                "aborted", CurlECode.WRITE_ERROR, response
+            )
+        }
+        if aborted
+        else {"return_value": response}
+    )
+    with mock.patch.object(check_pdf_hyperlinks.curl_requests, "get", **kwargs) as get:
+        validators = check_pdf_hyperlinks._validate_url_impersonating(
+            "https://example.com"
+        )
+    assert validators == {"ETag": '"abc"'}
+    assert get.call_args.kwargs["impersonate"] == "chrome"
+    response.raise_for_status.assert_called_once()
+
+
+def test_validate_url_impersonating_error() -> None:
+    error = curl_requests.RequestsError("unresolved", CurlECode.COULDNT_RESOLVE_HOST)
+    with mock.patch.object(
+        check_pdf_hyperlinks.curl_requests, "get", side_effect=error
+    ), pytest.raises(curl_requests.RequestsError, match="unresolved"):
+        check_pdf_hyperlinks._validate_url_impersonating("https://example.com")
+
+
+def test_validate_url_fallback() -> None:
+    # The server rejects httpx, but the impersonating fallback succeeds.
+    transport = httpx.MockTransport(lambda request: httpx.Response(404))
+    response = mock.Mock(headers={"ETag": '"abc"'})
+
+    async def target() -> dict:
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await check_pdf_hyperlinks._validate_url(
+                "https://example.com", client
+            )
+
+    with mock.patch.object(
+        check_pdf_hyperlinks.curl_requests, "get", return_value=response
+    ) as get:
+        assert asyncio.run(target()) == {"ETag": '"abc"'}
+    get.assert_called_once()
+    assert get.call_args.args == ("https://example.com",)
+
+
+def test_validate_urls_invalid() -> None:
+    urls = ["http:///no-hostname", "https://[::1", "https://example.com:invalid-port"]
+    errors = check_pdf_hyperlinks.validate_urls(urls)
+    # Each malformed url is reported without aborting validation of the others.
+    assert set(errors) == set(urls)
+    assert all(errors.values())
+
+
+@pytest.mark.parametrize(
+    "response_headers, expected",
+    [
+        ({}, {"ETag": '"abc"', "Last-Modified": "yesterday"}),
+        ({"ETag": '"def"'}, {"ETag": '"def"', "Last-Modified": "yesterday"}),
+    ],
+)
+def test_validate_url_not_modified(response_headers: dict, expected: dict) -> None:
+    headers = {"If-None-Match": '"abc"', "If-Modified-Since": "yesterday"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers["If-None-Match"] == '"abc"'
+        return httpx.Response(304, headers=response_headers)
+
+    async def target() -> dict:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await check_pdf_hyperlinks._validate_url(
+                "https://example.com", client, headers
+            )
+
+    # Cached validators should be kept unless the response replaces them.
+    assert asyncio.run(target()) == expected
+
+
+def test_url_cache(tmp_path: Path) -> None:
+    cache = check_pdf_hyperlinks.UrlCache(tmp_path / "cache.sqlite", ttl=60)
+    assert cache.get("https://example.com") == (False, {})
+
+    cache.set("https://example.com", {"ETag": '"abc"'})
+    assert cache.get("https://example.com") == (True, {"If-None-Match": '"abc"'})
+
+    # Expired entries should be validated again using a conditional request.
+    cache.ttl = 0
+    assert cache.get("https://example.com") == (False, {"If-None-Match": '"abc"'})
+    cache.close()
+
+
+def test_check_pdf_hyperlinks_cache(tmp_path: Path) -> None:
+    argv = ["tests/check_pdf_hyperlinks_ok.pdf", "--cache", str(tmp_path / "cache")]
+    with mock.patch.object(
+        check_pdf_hyperlinks,
+        "_validate_url",
+        return_value={},
+        new_callable=mock.AsyncMock,
+    ) as validate_url:
+        check_pdf_hyperlinks.CheckPdfHyperlinks.run(argv)
+        validate_url.assert_called_once()
+        # Run again and ensure the url is not validated again.
+        check_pdf_hyperlinks.CheckPdfHyperlinks.run(argv)
+        validate_url.assert_called_once()
+
+
+def test_check_pdf_hyperlinks_cache_closed_on_error(tmp_path: Path) -> None:
+    argv = ["tests/check_pdf_hyperlinks_ok.pdf", "--cache", str(tmp_path / "cache")]
+    close = check_pdf_hyperlinks.UrlCache.close
+    with mock.patch.object(
+        check_pdf_hyperlinks, "validate_urls", side_effect=RuntimeError("failed")
+    ), mock.patch.object(
+        check_pdf_hyperlinks.UrlCache, "close", autospec=True, side_effect=close
+    ) as close_mock, pytest.raises(
+        RuntimeError, match="failed"
+    ):
+        check_pdf_hyperlinks.CheckPdfHyperlinks.run(argv)
+    close_mock.assert_called_once()
+
+
+def test_check_pdf_hyperlinks_multiple_files(capsys: pytest.CaptureFixture) -> None:
+    argv = ["tests/check_pdf_hyperlinks_ok.pdf", "tests/check_pdf_hyperlinks_error.pdf"]
+    with mock.patch.object(
+        check_pdf_hyperlinks,
+        "_validate_url",
+        return_value={},
+        new_callable=mock.AsyncMock,
+    ) as validate_url:
+        check_pdf_hyperlinks.CheckPdfHyperlinks.run(argv)
+    out, _ = capsys.readouterr()
+    out = remove_colors(out)
+    assert "found 1 urls" in out
+    assert "found 4 urls" in out
+    # Each unique url should only be validated once across all documents.
+    urls = [call.args[0] for call in validate_url.call_args_list]
+    assert len(urls) == len(set(urls))
+
+
+def test_get_urls_shared_action(tmp_path: Path) -> None:
+    # Create a document with two link annotations sharing one indirect action and an
+    # internal link that should be skipped.
+    writer = pypdf.PdfWriter()
+    writer.add_blank_page(100, 100)
+    uri_action = writer._add_object(
+        DictionaryObject(
+            {
+                NameObject("/S"): NameObject("/URI"),
+                NameObject("/URI"): TextStringObject("https://example.com"),
+            }
+        )
+    )
+    goto = DictionaryObject(
+        {
+            NameObject("/S"): NameObject("/GoTo"),
+            NameObject("/D"): TextStringObject("section.1"),
+        }
+    )
+    annotations = ArrayObject()
+    for action in [uri_action, uri_action, goto]:
+        annotation = DictionaryObject(
+            {
+                NameObject("/Type"): NameObject("/Annot"),
+                NameObject("/Subtype"): NameObject("/Link"),
+                NameObject("/A"): action,
+            }
+        )
+        annotations.append(writer._add_object(annotation))
+    writer.pages[0][NameObject("/Annots")] = annotations
+    filename = tmp_path / "shared.pdf"
+    writer.write(filename)
+
+    assert list(check_pdf_hyperlinks.get_urls(filename)) == 2 * [
+        (0, "https://example.com")
+    ]
@@ -1,8 +1,8 @@
+from pathlib import Path
 import pytest
 import re
 from snippets.check_references import CheckReferences
 from typing import List
-from unittest import mock
 
 
 @pytest.mark.parametrize(
@@ -23,27 +23,42 @@ from unittest import mock
             r"\bibitem[{Bishop(2006)}]{Bishop2006} \bibitem{key}",
             [r"missing references: Bishop2006", r"extra references: other"],
         ),
+        (
+            '@string{jan = "January"}\n@article{key, ...}',
+            r"\bibitem{key}",
+            [r"no missing references", r"no extra references"],
+        ),
+        (
+            "@article{ key ,\n ...}\n@book{\nother\n, ...}",
+            r"\bibitem{key} \bibitem{other}",
+            [r"no missing references", r"no extra references"],
+        ),
     ],
 )
 def test_check_references_bbl(
-    bib: str, bbl: str, patterns: List[str], capsys: pytest.CaptureFixture
+    bib: str,
+    bbl: str,
+    patterns: List[str],
+    capsys: pytest.CaptureFixture,
+    tmp_path: Path,
 ) -> None:
-    with mock.patch("pathlib.Path.read_text", side_effect=[bib, bbl]):
-        CheckReferences.run(["bib-file", "bbl-file"])
+    (tmp_path / "refs.bib").write_text(bib)
+    (tmp_path / "refs.bbl").write_text(bbl)
+    CheckReferences.run([str(tmp_path / "refs.bib"), str(tmp_path / "refs.bbl")])
 
     outerr = capsys.readouterr()
     for pattern in patterns:
         assert re.search(pattern, outerr.out)
 
 
-def test_check_references(capsys: pytest.CaptureFixture) -> None:
+def test_check_references(capsys: pytest.CaptureFixture, tmp_path: Path) -> None:
     bib = """
     doi = {10.48550/arXiv.1804.06788},
     ...
     doi = {bla-bla},
     """
-    with mock.patch("pathlib.Path.read_text", return_value=bib):
-        CheckReferences.run(["bib-file", "--check-dois"])
+    (tmp_path / "refs.bib").write_text(bib)
+    CheckReferences.run([str(tmp_path / "refs.bib"), "--check-dois"])
 
     outerr = capsys.readouterr()
     assert "10.48550/arXiv.1804.06788" not in outerr.out
@@ -1,16 +1,21 @@
 import numpy as np
 import pytest
 from scipy import stats
-from snippets.empirical_distribution import normalize_cdf, sample_empirical_pdf
+from snippets.empirical_distribution import (
+    normalize_cdf,
+    sample_empirical_cdf,
+    sample_empirical_pdf,
+)
 from typing import Optional, Tuple, Union
 
 
-@pytest.fixture
+# The grid and density are read-only so we share them across tests in the module.
+@pytest.fixture(scope="module")
 def x():
     return np.linspace(-5, 5, 1001)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def pdf(x: np.ndarray):
     return stats.norm.pdf(x)
 
@@ -23,6 +28,15 @@ def test_sample_empirical_pdf(x: np.ndarray, pdf: np.ndarray, kind: str) -> None
     assert np.unique(y).size == 1_700
 
 
+def test_sample_empirical_pdf_linear_fast_path(x: np.ndarray, pdf: np.ndarray) -> None:
+    # The numpy fast path must agree with scipy's first-order spline interpolation.
+    fast, spline = [
+        sample_empirical_pdf(x, pdf, 100, kind, np.random.RandomState(0), tol=1e-5)
+        for kind in ["linear", "slinear"]
+    ]
+    np.testing.assert_allclose(fast, spline)
+
+
 def test_sample_empirical_pdf_without_shape(x: np.ndarray, pdf: np.ndarray) -> None:
     assert sample_empirical_pdf(x, pdf, tol=1e-5).shape == ()
 
@@ -51,15 +65,36 @@ def test_rv_non_increasing() -> None:
         sample_empirical_pdf(np.zeros(3), np.zeros(3) * np.nan)
 
 
+def test_sample_empirical_cdf_list() -> None:
+    y = sample_empirical_cdf([0, 1, 2], [0, 0.5, 1], size=10)
+    assert y.shape == (10,)
+    assert ((y >= 0) & (y <= 2)).all()
+
+    with pytest.raises(ValueError, match="strictly increasing"):
+        sample_empirical_cdf([0, 0, 1], [0, 0.5, 1])
+
+
 def test_normalize_cdf() -> None:
     cdf = np.linspace(0, 1)
     np.testing.assert_allclose(normalize_cdf(cdf), cdf)
     # Normalize without validation.
     np.testing.assert_allclose(normalize_cdf(1 + cdf), cdf)
 
+    # Normalize into a buffer, including in-place.
+    out = np.empty_like(cdf)
+    assert normalize_cdf(1 + cdf, out=out) is out
+    np.testing.assert_allclose(out, cdf)
+    out = 1 + cdf
+    assert normalize_cdf(out, out=out) is out
+    np.testing.assert_allclose(out, cdf)
+
     # Complain about non-monotone cdf.
     with pytest.raises(ValueError, match="must be non-decreasing"):
         normalize_cdf(cdf[::-1], tol=0)
+    # Accept sequences that are not arrays.
+    with pytest.raises(ValueError, match="must be non-decreasing"):
+        normalize_cdf([0, 1, 0.5])
+    np.testing.assert_allclose(normalize_cdf([1, 2, 3]), [0, 0.5, 1])
 
     # Complain about the initial value.
     with pytest.raises(ValueError, match="must start with 0"):
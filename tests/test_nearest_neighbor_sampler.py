@@ -5,64 +5,74 @@ from sklearn.exceptions import NotFittedError
 from snippets.nearest_neighbor_sampler import NearestNeighborSampler
 
 
-def sample_params(n: int, p: int) -> np.ndarray:
-    return np.random.normal(0, 1, (n, p))
+def sample_params(n: int, p: int, rng: np.random.Generator) -> np.ndarray:
+    return rng.standard_normal((n, p))
 
 
-def sample_data(params: np.ndarray) -> np.ndarray:
-    n = params.shape[0]
-    x = params + np.random.normal(0, 0.1, (n, 2))
-    return np.hstack([x, np.random.normal(0, 10, (n, 1))])
+def sample_data(params: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # Draw all noise at once and transform it in place. Two informative features
+    # depend on the parameters (broadcasting a single parameter) and one is noise.
+    data = rng.standard_normal((params.shape[0], 3))
+    data[:, :2] *= 0.1
+    data[:, :2] += params
+    data[:, 2] *= 10
+    return data
 
 
-@pytest.fixture(params=[1, 2])
+@pytest.fixture(scope="module", params=[1, 2])
 def n_params(request: pytest.FixtureRequest) -> int:
     return request.param
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simulated_params(n_params: int) -> np.ndarray:
-    return sample_params(100_000, n_params)
+    return sample_params(100_000, n_params, np.random.default_rng(1))
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simulated_data(simulated_params: np.ndarray) -> np.ndarray:
-    return sample_data(simulated_params)
+    return sample_data(simulated_params, np.random.default_rng(2))
+
+
+@pytest.fixture(scope="module", params=[False, True])
+def multi_output(request: pytest.FixtureRequest) -> bool:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def sampler(
+    simulated_data: np.ndarray, simulated_params: np.ndarray, multi_output: bool
+) -> NearestNeighborSampler:
+    # Build the nearest neighbor index once for each configuration.
+    if not multi_output:
+        simulated_params = np.squeeze(simulated_params)
+    return NearestNeighborSampler(frac=0.0017).fit(simulated_data, simulated_params)
 
 
 @pytest.fixture
-def latent_params(n_params: int) -> np.ndarray:
-    return sample_params(100, n_params)
+def latent_params(n_params: int, rng: np.random.Generator) -> np.ndarray:
+    return sample_params(100, n_params, rng)
 
 
 @pytest.fixture
-def observed_data(latent_params: np.ndarray) -> np.ndarray:
-    return sample_data(latent_params)
+def observed_data(latent_params: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return sample_data(latent_params, rng)
 
 
-@pytest.mark.parametrize("multi_output", [False, True])
 def test_posterior_mean_correlation(
-    simulated_data: np.ndarray,
-    simulated_params: np.ndarray,
+    sampler: NearestNeighborSampler,
     observed_data: np.ndarray,
     latent_params: np.ndarray,
+    n_params: int,
     multi_output: bool,
 ) -> None:
-    if not multi_output:
-        simulated_params = np.squeeze(simulated_params)
-
-    sampler = NearestNeighborSampler(frac=0.0017).fit(simulated_data, simulated_params)
     samples = sampler.predict(observed_data)
     posterior_mean = samples.mean(axis=1)
     pearsonr = stats.pearsonr(posterior_mean.ravel(), latent_params.ravel())
     assert pearsonr.statistic > 0.8 and pearsonr.pvalue < 0.01
 
-    if multi_output or simulated_params.ndim > 1:
-        expected_shape = (
-            observed_data.shape[0],
-            sampler.n_samples,
-            simulated_params.shape[1],
-        )
+    if multi_output or n_params > 1:
+        expected_shape = (observed_data.shape[0], sampler.n_samples, n_params)
     else:
         expected_shape = (observed_data.shape[0], sampler.n_samples)
     assert samples.shape == expected_shape
@@ -75,10 +85,12 @@ def test_nearest_neighbor_not_fitted() -> None:
 
 @pytest.mark.parametrize("n_samples", [1, 2])
 @pytest.mark.parametrize("batch_size", [1, 7])
-def test_nearest_neighbor_single_sample(n_samples: int, batch_size: int) -> None:
+def test_nearest_neighbor_single_sample(
+    n_samples: int, batch_size: int, rng: np.random.Generator
+) -> None:
     sampler = NearestNeighborSampler(n_samples=n_samples)
-    sampler.fit(np.random.normal(0, 1, (100, 3)), np.random.normal(0, 1, (100, 2)))
-    samples = sampler.predict(np.random.normal(0, 1, (batch_size, 3)))
+    sampler.fit(rng.standard_normal((100, 3)), rng.standard_normal((100, 2)))
+    samples = sampler.predict(rng.standard_normal((batch_size, 3)))
     assert samples.shape == (batch_size, n_samples, 2)
 
 
@@ -11,7 +11,11 @@ from unittest import mock
 @pytest.mark.parametrize("threshold", [0.1, 0.2])
 @pytest.mark.parametrize("threshold_mode", ["abs", "rel"])
 def test_stop_on_plateau(
-    mode: str, patience: int, threshold: float, threshold_mode: str
+    mode: str,
+    patience: int,
+    threshold: float,
+    threshold_mode: str,
+    rng: np.random.Generator,
 ) -> None:
     # Construct a dummy learning rate scheduler which should behave the same as our
     # `StopOnPlateau`.
@@ -29,12 +33,14 @@ def test_stop_on_plateau(
     with mock.patch(
         "torch.optim.lr_scheduler.ReduceLROnPlateau._reduce_lr"
     ) as _reduce_lr:
-        while True:
-            value = np.exp(np.random.normal(0, 1))
+        # Draw the sequence of values up front; the plateau is reached much sooner.
+        for value in np.exp(rng.standard_normal(1_000)):
             scheduler.step(value)
             if stop.step(value):
                 break
             _reduce_lr.assert_not_called()
+        else:
+            pytest.fail("did not reach a plateau")
         _reduce_lr.assert_called_once()
 
 
@@ -42,10 +48,14 @@ def test_stop_on_plateau_invalid() -> None:
     with pytest.raises(ValueError, match="foobar"):
         StopOnPlateau(mode="foobar")
 
-    stop = StopOnPlateau()
-    stop.mode = "foobar"
     with pytest.raises(ValueError, match="foobar"):
-        stop.is_better(3, 4)
+        StopOnPlateau(threshold_mode="foobar")
+
+    # Settings folded into the comparison cannot be changed after construction.
+    stop = StopOnPlateau()
+    for name in ["mode", "threshold", "threshold_mode"]:
+        with pytest.raises(AttributeError):
+            setattr(stop, name, getattr(stop, name))
 
 
 @pytest.mark.parametrize(
@@ -5,7 +5,7 @@ import torch as th
 from typing import Tuple
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def shapes() -> param_dict.ShapeDict:
     return {
         "a": (),
@@ -14,7 +14,7 @@ def shapes() -> param_dict.ShapeDict:
     }
 
 
-@pytest.fixture(params=[(), (3,), (9, 5)])
+@pytest.fixture(scope="module", params=[(), (3,), (9, 5)])
 def batch_shape(request: pytest.FixtureRequest) -> Tuple[int]:
     return request.param
 
@@ -24,17 +24,25 @@ def use_torch(request: pytest.FixtureRequest) -> bool:
     return request.param
 
 
+@pytest.fixture(scope="module")
+def numpy_params(
+    batch_shape: Tuple[int], shapes: param_dict.ShapeDict
+) -> "param_dict.ParamDict":
+    rng = np.random.default_rng(1)
+    return {
+        param: rng.standard_normal(batch_shape + shape)
+        for param, shape in shapes.items()
+    }
+
+
 @pytest.fixture
 def params(
-    batch_shape: Tuple[int], shapes: param_dict.ShapeDict, use_torch: bool
+    numpy_params: "param_dict.ParamDict", use_torch: bool
 ) -> "param_dict.ParamDict":
+    # Share the numpy buffers with torch rather than drawing new values.
     return {
-        param: (
-            th.randn(batch_shape + shape)
-            if use_torch
-            else np.random.normal(0, 1, batch_shape + shape)
-        )
-        for param, shape in shapes.items()
+        param: th.from_numpy(value) if use_torch else value
+        for param, value in numpy_params.items()
     }
 
 
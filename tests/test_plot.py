@@ -1,28 +1,43 @@
 from matplotlib.lines import Line2D
 from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 from matplotlib.path import Path
 from matplotlib import pyplot as plt
+from matplotlib.text import Text
 import numpy as np
 import pytest
 from snippets.plot import (
     arrow_path,
     dependence_heatmap,
     get_anchor,
+    get_anchors,
     label_axes,
     parameterization_mutual_info,
     plot_band,
     rounded_path,
 )
-from typing import Iterable, Optional, Union
+from typing import Iterable, Optional, Tuple, Union
 
 
-def test_plot_band() -> None:
+@pytest.fixture(autouse=True)
+def close_figures() -> None:
+    # Close figures after each test so they do not accumulate in pyplot.
+    yield
+    plt.close("all")
+
+
+def test_plot_band(rng: np.random.Generator) -> None:
     x = np.linspace(0, 2 * np.pi, 20)
-    ys = np.sin(x) + np.random.normal(0, 0.25, (100, x.size))
+    ys = np.sin(x) + 0.25 * rng.standard_normal((100, x.size))
     line, band = plot_band(x, ys)
     assert isinstance(line, Line2D)
     assert isinstance(band, PolyCollection)
 
+    # Check that presorted samples give the same band.
+    presorted, _ = plot_band(x, np.sort(ys, axis=0), presorted=True, upper=1)
+    expected, _ = plot_band(x, ys, upper=1)
+    np.testing.assert_allclose(presorted.get_ydata(), expected.get_ydata())
+
 
 def test_rounded_path() -> None:
     vertices = [(0, 0), (1, 0), (1, 1)]
@@ -31,6 +46,24 @@ def test_rounded_path() -> None:
     with pytest.raises(ValueError, match="at least two"):
         rounded_path([], 0, 0)
 
+    with pytest.raises(ValueError, match="must not coincide"):
+        rounded_path([(0, 0), (1, 0), (1, 0)], 0.2)
+
+
+def test_rounded_path_readonly() -> None:
+    vertices = [(0, 0), (1, 0), (1, 1)]
+    path = rounded_path(vertices, 0.2, readonly=True)
+    assert path.readonly
+    assert rounded_path(np.asarray(vertices), 0.2, readonly=True) is path
+    assert rounded_path(vertices, 0.3, readonly=True) is not path
+    assert rounded_path(vertices, 0.2) is not path
+
+
+def test_rounded_path_single_segment() -> None:
+    path = rounded_path([(0, 0), (0, 2)], 0.2, 0.5)
+    np.testing.assert_allclose(path.vertices, [(0, 0.5), (0, 1.5)])
+    np.testing.assert_array_equal(path.codes, [Path.MOVETO, Path.LINETO])
+
 
 @pytest.mark.parametrize("labels", ["a", ("a", "b"), None])
 def test_label_axes(labels: Optional[Union[str, Iterable[str]]]) -> None:
@@ -47,12 +80,25 @@ def test_label_axes(labels: Optional[Union[str, Iterable[str]]]) -> None:
     # Add a label to a single axes.
     label_axes(axes[0, 0], "foo", loc="bottom right")
 
+    # Use lazily generated labels.
+    labels = label_axes(axes.ravel(), (str(i) for i in range(100)), label_offset=3)
+    assert [label.get_text() for label in labels] == ["3", "4", "5", "6"]
+
 
-def test_get_anchor() -> None:
-    fig, ax = plt.subplots()
+@pytest.fixture(scope="module")
+def drawn_texts() -> Tuple[Text, Text]:
+    # Use a figure outside pyplot so closing figures after each test does not affect
+    # it, and lay it out once for all anchor tests.
+    fig = Figure()
+    ax = fig.subplots()
     text = ax.text(0.5, 0.5, "hello")
     padded = ax.text(0.5, 0.5, "hello", bbox={"boxstyle": "round,pad=0.5"})
     fig.draw_without_rendering()
+    return text, padded
+
+
+def test_get_anchor(drawn_texts: Tuple[Text, Text]) -> None:
+    text, padded = drawn_texts
 
     # We are using bottom alignment so three o'clock should be above the specified y
     # coordinate.
@@ -63,43 +109,63 @@ def test_get_anchor() -> None:
     # Ensure periodicity.
     np.testing.assert_allclose(three, get_anchor(text, 15))
 
+    # Ensure we get the same result with a precomputed inverse transform.
+    inverse = text.axes.transData.inverted()
+    np.testing.assert_allclose(three, get_anchor(text, 3, inverse))
+
     # Ensure the anchor is always further away if we have a bounding box.
     assert get_anchor(text, 3).x < get_anchor(padded, 3).x
     np.testing.assert_allclose(get_anchor(text, 3).y, get_anchor(padded, 3).y)
 
 
+def test_get_anchors(drawn_texts: Tuple[Text, Text]) -> None:
+    _, padded = drawn_texts
+    hours = np.arange(24).reshape((2, 12))
+    anchors = get_anchors(padded, hours)
+    assert anchors.shape == (2, 12, 2)
+    for hour, anchor in zip(hours.ravel(), anchors.reshape((-1, 2))):
+        np.testing.assert_allclose(anchor, get_anchor(padded, hour))
+
+
 def test_arrow_path() -> None:
     path = rounded_path([(0, 0), (0, 1)], 0.2)
     arrow = arrow_path(path, 0.2)
     # Check for three tips plus the closing vertex.
     assert len(arrow.vertices) == 4
 
+    with pytest.raises(ValueError, match="non-zero length"):
+        arrow_path(Path([(0, 0), (0, 0)]), 0.2)
+
 
 @pytest.mark.parametrize("method", ["corrcoef", "nmi"])
-def test_dependence_heatmap(method: str) -> None:
+def test_dependence_heatmap(method: str, rng: np.random.Generator) -> None:
     n = 23
     samples = {
-        "a": np.random.normal(0, 1, n),
-        "b": np.random.normal(0, 1, (n, 2)),
-        "c": np.random.normal(0, 1, (n, 2, 3)),
+        "a": rng.standard_normal(n),
+        "b": rng.standard_normal((n, 2)),
+        "c": rng.standard_normal((n, 2, 3)),
     }
     im = dependence_heatmap(samples, method=method)
     assert im.get_array().shape == (9, 9)
 
 
 @pytest.mark.parametrize("prior_dominated", [False, True])
-def test_parameterization_mutual_info(prior_dominated: bool) -> None:
+def test_parameterization_mutual_info(
+    prior_dominated: bool, rng: np.random.Generator
+) -> None:
     n = 1000
     p = 10
-    scale = np.exp(np.random.normal(0, 1, n))
+    # Draw the log scale and the parameters at once.
+    values = rng.standard_normal((n, p + 1))
+    scale = np.exp(values[:, 0])
 
     # Example parameters dominated by the data, i.e., `x` is independent of `scale`.
-    x = np.random.normal(0, 1, (n, p))
+    x = values[:, 1:]
 
     if prior_dominated:
         # Example parameters dominated by the prior, i.e., `x` is strongly informed by
         # `scale`.
-        x = x * scale[:, None]
+        x *= scale[:, None]
 
     assert x.shape == (n, p)
 
@@ -2,12 +2,30 @@ import numpy as np
 import pytest
 from scipy.stats import gaussian_kde
 from snippets.stats import GaussianKernelDensity, evaluate_bounded_kde_logpdf
+from unittest import mock
+import warnings
+
+
+@pytest.fixture(scope="module", params=[1, 2, 3])
+def n_features(request: pytest.FixtureRequest) -> int:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def samples(n_features: int) -> np.ndarray:
+    return np.random.default_rng(1).standard_normal((n_features, 100))
+
+
+@pytest.fixture(scope="module")
+def kde(samples: np.ndarray) -> gaussian_kde:
+    return gaussian_kde(samples)
 
 
-@pytest.mark.parametrize("n_features", [1, 2, 3])
 @pytest.mark.parametrize("bounds", [False, True])
-def test_bounded_kernel_density(n_features: int, bounds: bool) -> None:
-    x = np.random.normal(0, 1, (100, n_features))
+def test_bounded_kernel_density(
+    samples: np.ndarray, n_features: int, bounds: bool
+) -> None:
+    x = samples.T
     bounds = [(0, 1) for _ in range(n_features)] if bounds else None
     estimator = GaussianKernelDensity(bounds=bounds)
     estimator.fit(x)
@@ -17,21 +35,24 @@ def test_bounded_kernel_density(n_features: int, bounds: bool) -> None:
     assert estimator.bandwidth_factor_ > 0
 
 
-@pytest.mark.parametrize("n_features", [1, 2, 3])
-def test_evaluate_bounded_kde_logpdf(n_features: int) -> None:
-    x = np.random.normal(0, 1, (n_features, 100))
-    estimator = gaussian_kde(x)
+def test_evaluate_bounded_kde_logpdf(
+    kde: gaussian_kde, samples: np.ndarray, n_features: int, rng: np.random.Generator
+) -> None:
     bounds = [(0, 1) for _ in range(n_features)]
-    scores = evaluate_bounded_kde_logpdf(estimator, x, bounds)
+    scores = evaluate_bounded_kde_logpdf(kde, samples, bounds)
     assert scores.shape == (100,)
 
     # Test single sample evaluation.
-    x = np.random.uniform(0, 1, n_features)
-    assert evaluate_bounded_kde_logpdf(estimator, x, bounds).shape == (1,)
+    x = rng.uniform(0, 1, n_features)
+    assert evaluate_bounded_kde_logpdf(kde, x, bounds).shape == (1,)
 
+    # Test evaluation far from the data where the density underflows.
+    x = np.full(n_features, 1e3)
+    assert np.isfinite(evaluate_bounded_kde_logpdf(kde, x, bounds)).all()
 
-def test_bounded_normalization() -> None:
-    x = np.random.uniform(0, 1, (20, 1))
+
+def test_bounded_normalization(rng: np.random.Generator) -> None:
+    x = rng.uniform(0, 1, (20, 1))
     lin = np.linspace(0, 1, 500)
 
     # Check that the normalization is correct with bounds...
@@ -39,7 +60,50 @@ def test_bounded_normalization() -> None:
     norm = np.trapz(np.exp(estimator.score_samples(lin[:, None])), lin)
     assert abs(norm - 1) < 1e-6
 
-    # ...and is wrong without bounds.
-    estimator = GaussianKernelDensity().fit(x)
+    # ...and is wrong without bounds or with infinite bounds.
+    for bounds in [None, (-np.inf, np.nan)]:
+        estimator = GaussianKernelDensity(bounds=bounds).fit(x)
+        norm = np.trapz(np.exp(estimator.score_samples(lin[:, None])), lin)
+        assert abs(norm - 1) > 0.01
+
+
+def test_semi_bounded_normalization(rng: np.random.Generator) -> None:
+    x = rng.exponential(1, (20, 1))
+    lin = np.linspace(0, 20, 5000)
+
+    # Only the finite lower bound should be reflected.
+    estimator = GaussianKernelDensity(bounds=(0, np.nan)).fit(x)
     norm = np.trapz(np.exp(estimator.score_samples(lin[:, None])), lin)
-    assert abs(norm - 1) > 0.01
+    assert abs(norm - 1) < 1e-3
+
+
+@pytest.mark.parametrize("chunk_elements", [50, 2**16])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_univariate_kde_logpdf(
+    weighted: bool, chunk_elements: int, rng: np.random.Generator
+) -> None:
+    x = rng.standard_normal(100)
+    weights = rng.uniform(0, 1, 100) if weighted else None
+    estimator = GaussianKernelDensity().fit(x[:, None], sample_weight=weights)
+    # Use more points than fit in a single chunk. The smaller budget holds fewer
+    # elements than the training set so each chunk comprises a single point.
+    lin = np.linspace(-3, 3, 2500)
+    with mock.patch("snippets.stats.UNIVARIATE_CHUNK_ELEMENTS", chunk_elements):
+        actual = estimator.score_samples(lin[:, None])
+    np.testing.assert_allclose(actual, estimator.kde_.logpdf(lin))
+
+
+def test_bounded_kde_logpdf_zero_density(rng: np.random.Generator) -> None:
+    # Scipy's estimates are finite in log space, so we mock them to assign zero density
+    # to points far away from the data.
+    def _kde_logpdf(kde: gaussian_kde, points: np.ndarray) -> np.ndarray:
+        return np.where(np.abs(points[0]) > 10, -np.inf, 0.0)
+
+    kde = gaussian_kde(rng.uniform(0, 1, 20))
+    # A bounded interval gives more than two reflections.
+    with mock.patch(
+        "snippets.stats._kde_logpdf", _kde_logpdf
+    ), warnings.catch_warnings():
+        warnings.simplefilter("error")
+        actual = evaluate_bounded_kde_logpdf(kde, [0.5, 100], [0, 1])
+    np.testing.assert_allclose(actual, [np.log(3), -np.inf])
@@ -3,6 +3,7 @@ import pytest
 from snippets.tensor_data_loader import TensorDataLoader
 import torch
 from torch.utils.data import DataLoader, TensorDataset
+from unittest import mock
 
 
 @pytest.fixture(
@@ -45,11 +46,96 @@ def test_tensor_data_loader_shuffle(dataset: TensorDataset, batch_size: int) ->
     dataset = TensorDataset(torch.arange(len(dataset)), *dataset.tensors)
     loader = TensorDataLoader(dataset, batch_size, shuffle=True)
 
-    # Iterate over batches and transpose them to get the tensors back.
-    indices, *transposed = [torch.concat(batches, axis=0) for batches in zip(*loader)]
+    # Iterate over batches and copy them into preallocated tensors to get the tensors
+    # back.
+    indices, *transposed = [torch.empty_like(x) for x in dataset.tensors]
+    offset = 0
+    for batch in loader:
+        size = batch[0].shape[0]
+        for target, x in zip([indices, *transposed], batch):
+            target[offset : offset + size] = x
+        offset += size
+    assert offset == len(dataset)
     order = torch.argsort(indices)
 
     assert torch.diff(indices).unique().numel() > 1, "indices are not shuffled"
 
     for actual, expected in zip(transposed, dataset.tensors[1:]):
         torch.testing.assert_close(actual[order], expected)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize(
+    "pin_memory",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not torch.cuda.is_available(), reason="pinning requires cuda"
+            ),
+        ),
+    ],
+)
+def test_tensor_data_loader_device(
+    dataset: TensorDataset, shuffle: bool, pin_memory: bool
+) -> None:
+    device = torch.device("cuda" if pin_memory else "cpu")
+    loader = TensorDataLoader(
+        dataset, 4, shuffle=shuffle, pin_memory=pin_memory, device=device
+    )
+    for batch in loader:
+        assert all(x.device.type == device.type for x in batch)
+
+
+def test_tensor_data_loader_pin_once(dataset: TensorDataset) -> None:
+    # Pinning requires an accelerator so we copy tensors instead.
+    pinned = []
+
+    def pin_memory(self: torch.Tensor) -> torch.Tensor:
+        pinned.append(self)
+        return self.clone()
+
+    with mock.patch.object(torch.Tensor, "pin_memory", pin_memory):
+        loader = TensorDataLoader(dataset, 4, pin_memory=True)
+        for _ in range(3):
+            for batch1, batch2 in zip(loader, DataLoader(dataset, 4)):
+                for tensor1, tensor2 in zip(batch1, batch2):
+                    torch.testing.assert_close(tensor1, tensor2)
+    # Each tensor is pinned once rather than once per epoch.
+    assert len(pinned) == len(dataset.tensors)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize(
+    "device",
+    [
+        # Tensors on the meta device cannot be pinned, just like tensors on accelerators.
+        "meta",
+        pytest.param(
+            "cuda",
+            marks=pytest.mark.skipif(
+                not torch.cuda.is_available(), reason="requires cuda"
+            ),
+        ),
+    ],
+)
+def test_tensor_data_loader_pin_non_cpu(shuffle: bool, device: str) -> None:
+    dataset = TensorDataset(torch.randn(10, 3, device=device), torch.randn(10))
+
+    def pin_memory(self: torch.Tensor) -> torch.Tensor:
+        assert self.device.type == "cpu", "only cpu tensors should be pinned"
+        return self.clone()
+
+    # Record pinning requests for shuffled tensors and allocate regular memory.
+    empty_like = torch.empty_like
+    with mock.patch.object(torch.Tensor, "pin_memory", pin_memory), mock.patch(
+        "torch.empty_like", side_effect=lambda x, pin_memory: empty_like(x)
+    ) as empty_like_mock:
+        loader = TensorDataLoader(dataset, 4, shuffle=shuffle, pin_memory=True)
+        for x, y in loader:
+            assert x.device.type == device
+            assert y.device.type == "cpu"
+    if shuffle:
+        pinned = [call.kwargs["pin_memory"] for call in empty_like_mock.call_args_list]
+        assert pinned == [False, True]
@@ -12,3 +12,10 @@ def test_timer() -> None:
         time.sleep(0.5)
 
     assert 0.5 < t.duration < 0.6
+
+
+def test_timer_running() -> None:
+    with Timer() as t:
+        time.sleep(0.1)
+        assert t.end is None
+        assert 0.1 < t.duration < 0.2